@@ -1,44 +1,37 @@
-import os
+from corpus import Corpus, write_pages
 
 SRC_UNITS_DIR = 'ordered_text_units'
 SRC_ORIG_DIR = 'ordered_text_page1_only'
 DST_DIR = 'ordered_text_units_named'
 
-os.makedirs(DST_DIR, exist_ok=True)
-
-def get_unit_names():
+def get_unit_names(units_corpus=None):
+    if units_corpus is None:
+        units_corpus = Corpus.load(SRC_UNITS_DIR)
     unit_names = set()
-    for fname in os.listdir(SRC_UNITS_DIR):
-        if fname.endswith('.txt'):
-            with open(os.path.join(SRC_UNITS_DIR, fname), 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if line.startswith('❖ '):
-                        unit_name = line[2:].strip()
-                        if unit_name:
-                            unit_names.add(unit_name)
+    for chapter in units_corpus.chapters_from_unit_pages():
+        unit_names.update(chapter.units)
     return unit_names
 
-def process_file(src_path, dst_path, unit_names):
-    with open(src_path, 'r', encoding='utf-8') as f:
-        lines = [line.rstrip() for line in f]
+def tag_lines(lines, unit_names):
     new_lines = []
     for line in lines:
+        line = line.rstrip()
         if line.strip() in unit_names:
             new_lines.append(f'UNIT NAME: {line.strip()}')
         else:
             new_lines.append(line)
-    with open(dst_path, 'w', encoding='utf-8') as f:
-        for line in new_lines:
-            f.write(line + '\n')
+    return new_lines
+
+def tag_pages(corpus, unit_names):
+    """Prefix every line of every page that is a unit name with 'UNIT NAME: ', in place."""
+    for page in corpus:
+        page.lines = tag_lines(page.lines, unit_names)
 
 def main():
     unit_names = get_unit_names()
-    for fname in os.listdir(SRC_ORIG_DIR):
-        if fname.endswith('.txt'):
-            src_path = os.path.join(SRC_ORIG_DIR, fname)
-            dst_path = os.path.join(DST_DIR, fname)
-            process_file(src_path, dst_path, unit_names)
+    corpus = Corpus.load(SRC_ORIG_DIR)
+    tag_pages(corpus, unit_names)
+    write_pages(corpus, DST_DIR)
 
 if __name__ == '__main__':
     main()
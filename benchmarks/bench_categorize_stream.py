@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Benchmark: extract_units.py + add_unit_name_prefix_v2.py + categorize_files.py
+versus categorize_stream.py's single pass.
+
+Generates a synthetic book shaped like data/ (chapters opening with a
+"Glava N" table-of-contents page of "❖ " units, some wrapped over two lines,
+then ~25-line pages of which about 60% carry a unit name line; about 2%
+name a unit of the next chapter, before its table of contents, as page 345
+of the book names Destruktor from page 348), --scale times the size of the
+real one: 15 chapters, 88 units and 458 pages at
+--scale 1. The three scripts are run as they are, through their
+intermediate directories; categorize_stream.py is run on the same
+directory and on a pack of it. The categories and tagged pages must come
+out the same.
+
+Usage:
+    python benchmarks/bench_categorize_stream.py
+    python benchmarks/bench_categorize_stream.py --scale 20 --repeat 5
+"""
+
+import argparse
+import contextlib
+import filecmp
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import add_unit_name_prefix_v2
+import categorize_files
+import extract_units
+from categorize_stream import categorize_stream
+from packed_corpus import pack_directory, page_filename
+
+CHAPTERS = 15
+UNITS = 88
+PAGES = 458
+HEADER = "Septembar 2024. Copyright 2018-2024 by Dragan Milićev"
+WORDS = ("klasa objekat konstruktor metod operator niz pokazivac referenca sablon "
+         "izuzetak nasledjivanje funkcija promenljiva tip vrednost poziv").split()
+
+def synthetic_pages(scale: int, seed: int = 0) -> dict:
+    """page number -> text of a synthetic book scale times the size of data/."""
+    rng = random.Random(seed)
+    chapters = CHAPTERS * scale
+    chapter_units = []
+    for c in range(1, chapters + 1):
+        count = UNITS * scale // chapters + (c <= UNITS * scale % chapters)
+        chapter_units.append([f"Jedinica {c}.{u} {rng.choice(WORDS)} {rng.choice(WORDS)}" for u in range(1, count + 1)])
+    pages = {}
+    number = 1
+    for c, units in enumerate(chapter_units, start=1):
+        # a unit of the next chapter, named before its table of contents
+        ahead = chapter_units[c] if c < chapters else units
+        toc = [HEADER, f"Glava {c}: Poglavlje {c}"]
+        for name in units:
+            head, _, tail = name.rpartition(" ")
+            toc.extend([f"❖ {head}", tail] if rng.random() < 0.2 else [f"❖ {name}"])
+        toc.append(f" {number}")
+        pages[number] = "\n".join(toc) + "\n"
+        number += 1
+        for _ in range(PAGES * scale // chapters + (c <= PAGES * scale % chapters) - 1):
+            lines = [HEADER]
+            draw = rng.random()
+            if draw < 0.02:
+                lines.append(rng.choice(ahead))
+            elif draw < 0.6:
+                lines.append(rng.choice(units) + rng.choice(("", " ", "  ")))
+            lines.extend(" ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 8)))
+                         for _ in range(rng.randint(15, 30)))
+            lines.append(f" {number}")
+            pages[number] = "\n".join(lines) + "\n"
+            number += 1
+    return pages
+
+def write_corpus(pages: dict, out_dir: str):
+    os.makedirs(out_dir)
+    for number, text in pages.items():
+        with open(os.path.join(out_dir, page_filename(number)), "w", encoding="utf-8") as f:
+            f.write(text)
+
+def run_scripts(work: str) -> dict:
+    """The three scripts as run_pipeline.py runs them, from work/ordered_text_page1_only."""
+    cwd = os.getcwd()
+    os.chdir(work)
+    try:
+        categorize_files.SRC_UNITS_DIR = extract_units.DST_DIR
+        categorize_files.SRC_ORIG_DIR = add_unit_name_prefix_v2.DST_DIR
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            extract_units.main()
+            add_unit_name_prefix_v2.main()
+            categorize_files.main()
+        with open(categorize_files.DST_FILE, encoding="utf-8") as f:
+            return json.load(f)
+    finally:
+        os.chdir(cwd)
+
+def run_stream(source: str, tagged_dir: str) -> dict:
+    return categorize_stream(source, tagged_dir).categories()
+
+def best_of(repeat, fn, *args):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(*args)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def same_files(a: str, b: str) -> bool:
+    names = sorted(os.listdir(a))
+    if names != sorted(os.listdir(b)):
+        return False
+    _, mismatch, errors = filecmp.cmpfiles(a, b, names, shallow=False)
+    return not mismatch and not errors
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the unit/tag/categorize scripts with categorize_stream.py.")
+    parser.add_argument("--scale", type=int, default=10, help="Size of the synthetic book relative to data/ (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per approach, best is reported (default: %(default)s)")
+    args = parser.parse_args()
+
+    pages = synthetic_pages(args.scale)
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, extract_units.SRC_DIR)
+        write_corpus(pages, src)
+        pack = os.path.join(tmp, "pages.pack")
+        pack_directory(src, pack)
+        print(f"Synthetic corpus: {len(pages)} pages ({args.scale}x data/), best of {args.repeat}\n")
+
+        results = [
+            ("three scripts", best_of(args.repeat, run_scripts, tmp), os.path.join(tmp, add_unit_name_prefix_v2.DST_DIR)),
+            ("stream, directory", best_of(args.repeat, run_stream, src, os.path.join(tmp, "stream_dir")), os.path.join(tmp, "stream_dir")),
+            ("stream, pack", best_of(args.repeat, run_stream, pack, os.path.join(tmp, "stream_pack")), os.path.join(tmp, "stream_pack")),
+        ]
+        baseline_seconds = results[0][1][0]
+        expected = results[0][1][1]
+        print(f"{'approach':<20} {'time':>10} {'pages/s':>10} {'speedup':>8}")
+        for name, (seconds, categories), tagged_dir in results:
+            print(f"{name:<20} {seconds * 1000:8.1f}ms {len(pages) / seconds:10.0f} {baseline_seconds / seconds:7.1f}x")
+            if categories != expected:
+                print("  categories differ from the scripts'")
+            if not same_files(tagged_dir, results[0][2]):
+                print("  tagged pages differ from the scripts'")
+        categorized = sum(len(files) for files in expected.values())
+        print(f"\n{len(expected)} units, {categorized} pages categorized")
+
+if __name__ == "__main__":
+    main()
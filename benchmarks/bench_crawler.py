@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark: scra.py against the local stand-in course site.
+
+Starts benchmarks/course_site_server.py in-process, runs scra.py as a child
+process in a scratch directory once per --workers value, and appends one
+result per run (pages/s, MB/s, peak RSS, PDFs found) to a JSON file keyed by
+git commit, so runs from different commits can be compared. The previous
+result for the same configuration is printed next to each new one.
+
+Usage:
+    python benchmarks/bench_crawler.py
+    python benchmarks/bench_crawler.py --workers 1 4 16 --latency 0.02 --decks 100
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+REPO = os.path.dirname(HERE)
+sys.path.insert(0, HERE)
+
+from course_site_server import CourseSite, start_server, add_site_arguments, site_config_from_args
+
+RESULTS_FILE = os.path.join(HERE, "results", "crawler.json")
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return "unknown"
+
+def run_crawler(start_url, workers, rate, extra_args):
+    """Run scra.py in a scratch directory. Returns (elapsed, peak RSS in MB, requests, bytes, PDFs, exit code)."""
+    with tempfile.TemporaryDirectory() as work:
+        cmd = [sys.executable, os.path.join(REPO, "scra.py"), "--start-url", start_url,
+               "--workers", str(workers), "--rate", str(rate)] + extra_args
+        started = time.perf_counter()
+        with open(os.path.join(work, "crawl.log"), "w") as log:
+            proc = subprocess.Popen(cmd, cwd=work, stdout=log, stderr=subprocess.STDOUT)
+            _, status, usage = os.wait4(proc.pid, 0)
+        elapsed = time.perf_counter() - started
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        # ru_maxrss is in KB on Linux, bytes on macOS
+        rss_mb = usage.ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+        requests_made = 0
+        transferred = 0
+        with open(os.path.join(work, "crawl_metrics.jsonl"), encoding="utf-8") as f:
+            for line in f:
+                rec = json.loads(line)
+                requests_made += 1
+                transferred += rec.get("bytes", 0)
+        out_dir = os.path.join(work, "downloaded_pdfs_new")
+        pdfs = len([n for n in os.listdir(out_dir) if n.endswith(".pdf")]) if os.path.isdir(out_dir) else 0
+    return elapsed, rss_mb, requests_made, transferred, pdfs, proc.returncode
+
+def load_results(path):
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return []
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark scra.py against a local synthetic course site.")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 16], help="Worker counts to run (default: %(default)s)")
+    parser.add_argument("--rate", type=float, default=0, help="Per-host rate limit passed to scra.py, 0 disables (default: %(default)s)")
+    parser.add_argument("--scra-args", default="", help="Extra arguments for scra.py, e.g. --scra-args=\"--probe --link-backend regex\"")
+    parser.add_argument("--results", default=RESULTS_FILE, help="JSON file results are appended to (default: %(default)s)")
+    parser.add_argument("--label", default="", help="Free-form note stored with the results")
+    add_site_arguments(parser)
+    args = parser.parse_args()
+
+    config = site_config_from_args(args)
+    site = CourseSite(config)
+    server, start_url = start_server(site)
+    print(f"Site: {len(site.files)} files, {site.total_bytes / (1024 * 1024):.1f} MB, "
+          f"{site.pdf_count} distinct PDFs at {start_url}")
+
+    results = load_results(args.results)
+    commit = git_commit()
+    extra = args.scra_args.split()
+    print(f"{'workers':>7s}  {'time (s)':>8s}  {'pages/s':>8s}  {'MB/s':>7s}  {'RSS (MB)':>8s}  {'PDFs':>9s}  previous")
+    try:
+        for workers in args.workers:
+            elapsed, rss_mb, requests_made, transferred, pdfs, code = run_crawler(start_url, workers, args.rate, extra)
+            result = {
+                "commit": commit,
+                "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "label": args.label,
+                "site": vars(config),
+                "workers": workers,
+                "rate": args.rate,
+                "scra_args": args.scra_args,
+                "elapsed_s": round(elapsed, 3),
+                "requests": requests_made,
+                "pages_per_s": round(requests_made / elapsed, 2),
+                "mb_per_s": round(transferred / (1024 * 1024) / elapsed, 3),
+                "peak_rss_mb": round(rss_mb, 1),
+                "pdfs": pdfs,
+                "exit_code": code,
+            }
+            same = [r for r in results if r["site"] == result["site"] and r["workers"] == workers
+                    and r["rate"] == args.rate and r["scra_args"] == args.scra_args]
+            previous = f"{same[-1]['pages_per_s']} pages/s @ {same[-1]['commit']}" if same else "-"
+            results.append(result)
+            print(f"{workers:>7d}  {elapsed:8.2f}  {result['pages_per_s']:8.1f}  {result['mb_per_s']:7.2f}  "
+                  f"{rss_mb:8.1f}  {pdfs:>4d}/{site.pdf_count:<4d}  {previous}")
+    finally:
+        server.shutdown()
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.results)), exist_ok=True)
+    with open(args.results, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results appended to {args.results}")
+
+if __name__ == "__main__":
+    main()
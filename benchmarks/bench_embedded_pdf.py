@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark: embedded base64 PDF extraction, old regex passes vs. EmbeddedPdfScanner.
+
+Generates synthetic local_pdf({"pdf": "JVBERi0..."}) assets of a few sizes and
+times both implementations on each, along with their peak Python memory.
+Each asset's script first compares a string against "JVBERi0", a decoy that
+must not be saved in place of the deck; both implementations have to save
+the embedded PDF itself.
+
+Usage:
+    python benchmarks/bench_embedded_pdf.py
+    python benchmarks/bench_embedded_pdf.py --sizes 1 8 32 --repeat 5
+"""
+
+import argparse
+import base64
+import contextlib
+import io
+import os
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from embedded_pdf import EmbeddedPdfScanner
+from pdf_store import PdfStore
+
+CHUNK_SIZE = 64 * 1024
+
+DECOY = b"function isPdf(s) { if (s.indexOf(\"JVBERi0\") === 0) {} }\n"
+
+def make_asset(size_mb: int):
+    """A viewer asset wrapping a pseudo-PDF of roughly size_mb megabytes, and that PDF."""
+    pdf = b"%PDF-1.4\n" + os.urandom(size_mb * 1024 * 1024)
+    prefix = DECOY + b"/* viewer */ var meta = {\"title\": \"Predavanje\"};\nlocal_pdf({\"name\": \"deck\", \"pdf\": \""
+    return prefix + base64.b64encode(pdf) + b"\"});\n", pdf
+
+def legacy_extract(text, out_path_prefix):
+    """try_extract_base64_and_save as it was before the scanner."""
+    hits = re.findall(r'JVBERi0[^\"]{20,}', text)
+    for i, hit in enumerate(hits):
+        b64 = re.match(r'(JVBERi0[A-Za-z0-9+/=]+)', hit)
+        if b64:
+            s = b64.group(1)
+            try:
+                raw = base64.b64decode(s + "===")
+                if raw.startswith(b'%PDF'):
+                    out = f"{out_path_prefix}_embedded_{i}.pdf"
+                    with open(out, "wb") as f:
+                        f.write(raw)
+                    return out
+            except Exception:
+                pass
+    js_matches = re.findall(r'"pdf"\s*:\s*"([A-Za-z0-9+/=]+)"', text)
+    for i, s in enumerate(js_matches):
+        try:
+            raw = base64.b64decode(s + "===")
+            if raw.startswith(b'%PDF'):
+                out = f"{out_path_prefix}_embedded_json_{i}.pdf"
+                with open(out, "wb") as f:
+                    f.write(raw)
+                return out
+        except Exception:
+            pass
+    return None
+
+def run_legacy(asset_path, out_dir):
+    # the old crawler had the whole body as r.content and r.text
+    with open(asset_path, "rb") as f:
+        text = f.read().decode("utf-8")
+    return legacy_extract(text, os.path.join(out_dir, "asset"))
+
+def run_scanner(asset_path, out_dir):
+    scanner = EmbeddedPdfScanner(PdfStore(out_dir), "asset")
+    with open(asset_path, "rb") as f, contextlib.redirect_stdout(io.StringIO()):
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            scanner.feed(chunk)
+        return scanner.close()
+
+def measure(fn, asset_path, pdf, repeat):
+    best = None
+    peak = 0
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as out_dir:
+            tracemalloc.start()
+            started = time.perf_counter()
+            out = fn(asset_path, out_dir)
+            elapsed = time.perf_counter() - started
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+            if out is None:
+                raise RuntimeError(f"{fn.__name__} found no PDF in {asset_path}")
+            with open(out, "rb") as f:
+                if f.read() != pdf:
+                    raise RuntimeError(f"{fn.__name__} saved {out}, not the embedded PDF")
+            best = elapsed if best is None else min(best, elapsed)
+    return best, peak
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark embedded base64 PDF extraction.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 4, 16], help="Embedded PDF sizes in MB (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement; the best time is kept (default: %(default)s)")
+    args = parser.parse_args()
+
+    print(f"{'size':>6s}  {'impl':8s}  {'time (s)':>9s}  {'MB/s':>8s}  {'peak mem (MB)':>13s}")
+    with tempfile.TemporaryDirectory() as work:
+        for size_mb in args.sizes:
+            asset_path = os.path.join(work, f"asset_{size_mb}mb.js")
+            asset, pdf = make_asset(size_mb)
+            with open(asset_path, "wb") as f:
+                f.write(asset)
+            del asset
+            asset_mb = os.path.getsize(asset_path) / (1024 * 1024)
+            for name, fn in (("legacy", run_legacy), ("scanner", run_scanner)):
+                elapsed, peak = measure(fn, asset_path, pdf, args.repeat)
+                print(f"{size_mb:>4d}MB  {name:8s}  {elapsed:9.3f}  {asset_mb / elapsed:8.1f}  {peak / (1024 * 1024):13.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Benchmark: the extract_backends.py text extraction backends.
+
+Each backend runs in its own process over every page of --pdfs and is
+scored on:
+
+    pages/s     extraction throughput (opening the PDF included)
+    peak MB     growth of the process's peak RSS over its size after imports
+    similarity  mean difflib ratio between its page 1 text and the data/ text
+                of the same deck, compared line by line with whitespace collapsed
+    units       ❖ unit lines of data/ that the backend also produces as a line
+                (whitespace collapsed, so "❖Uvod" counts as "❖ Uvod")
+    exact ❖     decks whose lines starting with "❖ " are exactly those of data/;
+                categorize_files.py, create_hierarchical_categories.py and
+                add_unit_name_prefix_v2.py (the UNIT NAME lines) match that prefix
+                verbatim, so anything less needs normalising before they run
+
+The recommendation is the fastest backend that keeps at least --min-units of
+the units (kerning differences such as "canMoveT o" cost a few of them).
+
+Usage:
+    python benchmarks/bench_extractors.py
+    python benchmarks/bench_extractors.py --backends pypdf PyPDF2 --limit 100
+"""
+
+import argparse
+import difflib
+import multiprocessing
+import os
+import resource
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from extract_backends import available_backends, make_backend
+
+def _peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KB on Linux
+
+def _run_backend(name, paths, conn):
+    backend = make_backend(name)
+    baseline = _peak_rss_mb()
+    first_pages = {}
+    pages = errors = 0
+    started = time.perf_counter()
+    for path in paths:
+        try:
+            count = backend.open(path)
+        except Exception:
+            errors += 1
+            continue
+        for i in range(count):
+            try:
+                text = backend.page_text(i)
+            except Exception:
+                errors += 1
+                continue
+            pages += 1
+            if i == 0:
+                first_pages[os.path.basename(path)] = text
+    seconds = time.perf_counter() - started
+    conn.send((backend.key, pages, errors, seconds, _peak_rss_mb() - baseline, first_pages))
+    conn.close()
+
+def run_backend(name, paths):
+    """Run one backend in a fresh process, so its memory peak is its own."""
+    parent, child = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(target=_run_backend, args=(name, paths, child))
+    process.start()
+    child.close()
+    result = parent.recv()
+    process.join()
+    return result
+
+def normalized_lines(text: str) -> list:
+    lines = (" ".join(line.split()) for line in text.splitlines())
+    return [line for line in lines if line]
+
+def unit_lines(text: str) -> list:
+    return ["❖ " + line[1:].strip() for line in normalized_lines(text) if line.startswith("❖")]
+
+def exact_unit_lines(text: str) -> list:
+    return [line.rstrip() for line in text.splitlines() if line.startswith("❖ ")]
+
+def score(first_pages: dict, references: dict):
+    similarity = units_kept = exact = 0
+    units_total = sum(len(unit_lines(ref)) for ref in references.values())
+    for name, reference in references.items():
+        text = first_pages.get(name, "")
+        similarity += difflib.SequenceMatcher(None, normalized_lines(text), normalized_lines(reference)).ratio()
+        produced = set(normalized_lines(text))
+        units_kept += sum(1 for unit in unit_lines(reference) if unit in produced or unit.replace("❖ ", "❖", 1) in produced)
+        exact += exact_unit_lines(text) == exact_unit_lines(reference)
+    n = len(references) or 1
+    return similarity / n, units_kept, units_total, exact
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare text extraction backends for speed, memory and fidelity.")
+    parser.add_argument("--pdfs", default="ordered_pdfs", help="Folder of PDFs (default: %(default)s)")
+    parser.add_argument("--reference", default="data",
+                        help="Folder of page 1 texts named <pdf name>_extracted_text.txt (default: %(default)s)")
+    parser.add_argument("--backends", nargs="+", default=available_backends(), help="Backends to run (default: all available)")
+    parser.add_argument("--min-units", type=float, default=0.99,
+                        help="Share of units a backend must keep to be recommended (default: %(default)s)")
+    parser.add_argument("--limit", type=int, default=0, help="Only the first N PDFs (default: all)")
+    args = parser.parse_args()
+
+    names = sorted(n for n in os.listdir(args.pdfs) if n.lower().endswith(".pdf"))
+    if args.limit:
+        names = names[:args.limit]
+    paths = [os.path.join(args.pdfs, n) for n in names]
+    references = {}
+    for name in names:
+        ref = os.path.join(args.reference, os.path.splitext(name)[0] + "_extracted_text.txt")
+        if os.path.exists(ref):
+            with open(ref, "r", encoding="utf-8") as f:
+                references[name] = f.read()
+    print(f"{len(paths)} PDFs from {args.pdfs}, {len(references)} reference texts from {args.reference}")
+
+    rows = []
+    for backend in args.backends:
+        key, pages, errors, seconds, peak_mb, first_pages = run_backend(backend, paths)
+        similarity, kept, total, exact = score(first_pages, references)
+        rows.append((backend, key, pages / seconds if seconds else 0, peak_mb, similarity, kept, total, exact, errors))
+        print(f"  {key}: {pages} pages in {seconds:.1f}s")
+
+    print(f"\n{'backend':<22} {'pages/s':>8} {'peak MB':>8} {'similarity':>10} {'units':>11} {'exact ❖':>9} {'errors':>6}")
+    for backend, key, rate, peak_mb, similarity, kept, total, exact, errors in rows:
+        print(f"{key:<22} {rate:8.1f} {peak_mb:8.1f} {similarity:10.3f} {f'{kept}/{total}':>11} "
+              f"{f'{exact}/{len(references)}':>9} {errors:6d}")
+
+    keeping = [row for row in rows if row[5] >= args.min_units * row[6]]
+    if keeping:
+        best = max(keeping, key=lambda row: row[2])
+        print(f"\nFastest backend that keeps {args.min_units:.0%} of the ❖ units: {best[0]}")
+        if best[7] < len(references):
+            print(f"  but only {best[7]} of {len(references)} decks have the exact '❖ ' lines the categorizers match")
+    else:
+        print(f"\nNo backend keeps {args.min_units:.0%} of the ❖ units")
+
+if __name__ == "__main__":
+    main()
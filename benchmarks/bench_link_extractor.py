@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark: link extraction backends used by scra.py.
+
+Runs every backend in link_extractor.BACKENDS over a corpus of HTML pages and
+reports pages/sec, peak Python memory and whether the links found match the
+BeautifulSoup baseline. Save the course site's index pages into a folder and
+pass it with --corpus; without one, Apache-style directory listings like the
+course site's are generated.
+
+Usage:
+    python benchmarks/bench_link_extractor.py --corpus saved_index_pages/
+    python benchmarks/bench_link_extractor.py --pages 200 --entries 300
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from link_extractor import BACKENDS
+
+def make_listing(index: int, entries: int) -> str:
+    rows = []
+    for i in range(entries):
+        name = f"{index:03d}{i:04d}-deck.js" if i % 3 else f"folder_{i}/"
+        rows.append(
+            f'<tr><td valign="top"><img src="/icons/unknown.gif" alt="[   ]"></td>'
+            f'<td><a href="{name}">{name}</a></td><td align="right">2024-03-0{i % 9 + 1} 10:{i % 60:02d}  </td>'
+            f'<td align="right">{i * 7 % 900}K</td><td>&nbsp;</td></tr>'
+        )
+    return (
+        "<!DOCTYPE HTML PUBLIC \"-//W3C//DTD HTML 3.2 Final//EN\">\n<html>\n <head>\n"
+        f"  <title>Index of /assets/{index}</title>\n </head>\n <body>\n<h1>Index of /assets/{index}</h1>\n"
+        "<table>\n<tr><th><a href=\"?C=N;O=D\">Name</a></th><th><a href=\"?C=M;O=A\">Last modified</a></th></tr>\n"
+        "<tr><td><a href=\"/assets/\">Parent Directory</a></td></tr>\n"
+        + "\n".join(rows)
+        + "\n</table>\n</body></html>\n"
+    )
+
+def load_corpus(path):
+    pages = []
+    for name in sorted(os.listdir(path)):
+        full = os.path.join(path, name)
+        if os.path.isfile(full):
+            with open(full, "r", encoding="utf-8", errors="replace") as f:
+                pages.append(f.read())
+    return pages
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark link extraction backends.")
+    parser.add_argument("--corpus", help="Folder of saved HTML pages (default: generate listings)")
+    parser.add_argument("--pages", type=int, default=100, help="Generated pages (default: %(default)s)")
+    parser.add_argument("--entries", type=int, default=200, help="Links per generated page (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes over the corpus; the best is kept (default: %(default)s)")
+    args = parser.parse_args()
+
+    if args.corpus:
+        pages = load_corpus(args.corpus)
+    else:
+        pages = [make_listing(i, args.entries) for i in range(args.pages)]
+    if not pages:
+        print("No pages to benchmark.")
+        return
+    corpus_mb = sum(len(p.encode("utf-8")) for p in pages) / (1024 * 1024)
+    print(f"Corpus: {len(pages)} pages, {corpus_mb:.1f} MB")
+
+    baseline = [BACKENDS["bs4"](p) for p in pages]
+    print(f"{'backend':8s}  {'pages/s':>9s}  {'MB/s':>7s}  {'peak mem (MB)':>13s}  {'same links':>10s}")
+    for name, extract in BACKENDS.items():
+        best = None
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            for page in pages:
+                extract(page)
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        # memory is measured separately; tracemalloc slows everything down
+        peak = 0
+        for page in pages:
+            tracemalloc.start()
+            extract(page)
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+        same = sum(extract(p) == links for p, links in zip(pages, baseline))
+        print(f"{name:8s}  {len(pages) / best:9.1f}  {corpus_mb / best:7.2f}  {peak / (1024 * 1024):13.2f}  {same:>5d}/{len(pages)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark: loading the page corpus from data/ versus from a pack file.
+
+Compares what the categorization scripts do today (os.listdir, then open and
+read each page_XXXX_extracted_text.txt) with packed_corpus.PackedCorpus (one
+open, one mmap). Both read every page's text and count the "UNIT NAME:"
+lines, checking that the two agree. The pack is built in a temporary
+directory first; --copies repeats the corpus to see how both scale.
+
+Usage:
+    python benchmarks/bench_packed_corpus.py
+    python benchmarks/bench_packed_corpus.py --copies 10 --repeat 20
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from packed_corpus import PackedCorpus, pack_directory, page_filename, PAGE_FILE_RE
+
+def load_directory(path: str) -> dict:
+    pages = {}
+    for name in os.listdir(path):
+        match = PAGE_FILE_RE.match(name)
+        if match:
+            with open(os.path.join(path, name), "r", encoding="utf-8") as f:
+                pages[int(match.group(1))] = f.read()
+    return pages
+
+def load_pack(path: str) -> dict:
+    with PackedCorpus(path) as corpus:
+        return {page: corpus.text(page) for page in corpus.pages}
+
+def unit_lines(pages: dict) -> int:
+    return sum(text.count("\nUNIT NAME: ") + text.startswith("UNIT NAME: ") for text in pages.values())
+
+def best_of(repeat, fn, *args):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(*args)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare loading page texts from a directory and from a pack.")
+    parser.add_argument("--data", default="data", help="Directory of page_XXXX_extracted_text.txt files (default: %(default)s)")
+    parser.add_argument("--copies", type=int, default=1, help="Repeat the corpus this many times (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=10, help="Timed runs per approach, best is reported (default: %(default)s)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src = args.data
+        if args.copies > 1:
+            src = os.path.join(tmp, "pages")
+            os.makedirs(src)
+            names = sorted(n for n in os.listdir(args.data) if PAGE_FILE_RE.match(n))
+            for copy in range(args.copies):
+                for i, name in enumerate(names):
+                    shutil.copyfile(os.path.join(args.data, name), os.path.join(src, page_filename(copy * 10000 + i + 1)))
+        pack = os.path.join(tmp, "corpus.pack")
+        count = pack_directory(src, pack)
+        print(f"{count} pages, {sum(os.path.getsize(os.path.join(src, n)) for n in os.listdir(src)) / 1024:.0f} KB of text")
+
+        dir_time, from_dir = best_of(args.repeat, load_directory, src)
+        pack_time, from_pack = best_of(args.repeat, load_pack, pack)
+        assert from_dir == from_pack, "pack and directory disagree"
+        print(f"  directory: {dir_time * 1000:7.2f} ms  ({count} opens)")
+        print(f"  pack:      {pack_time * 1000:7.2f} ms  (1 open, 1 mmap)  {dir_time / pack_time:.1f}x faster")
+        print(f"  UNIT NAME lines: {unit_lines(from_pack)} (same in both)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark: last-pages fetch over HTTP Range requests vs. a full download.
+
+Serves direct PDFs from the synthetic course site, fetches the last pages of
+each with remote_pdf.fetch_last_pages and with a plain download followed by
+the same trim, and reports bytes transferred, requests and wall time. Every
+ranged result is checked against the full-download one (same page count and
+same page-number footers). Run it once more with --no-ranges to exercise the
+full-download fallback.
+
+Usage:
+    python benchmarks/bench_remote_pdf.py --pdfs 10 --deck-kb 4096 --pages 60
+    python benchmarks/bench_remote_pdf.py --latency 0.05
+    python benchmarks/bench_remote_pdf.py --no-ranges
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import requests
+from pypdf import PdfReader
+
+from course_site_server import CourseSite, add_site_arguments, site_config_from_args, start_server
+from remote_pdf import BLOCK_SIZE, fetch_last_pages, trim_pdf
+
+def footers(data: bytes):
+    return [page.extract_text().splitlines()[-1].strip() for page in PdfReader(io.BytesIO(data)).pages]
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ranged last-pages fetch against full downloads.")
+    parser.add_argument("--keep", type=int, default=2, help="Trailing pages to keep (default: %(default)s)")
+    parser.add_argument("--block-size", type=int, default=BLOCK_SIZE, help="Bytes per range request (default: %(default)s)")
+    add_site_arguments(parser)
+    parser.set_defaults(decks=0, noise=0, duplicates=0, depth=0, pdfs=10, deck_kb=2048, pages=40)
+    args = parser.parse_args()
+
+    site = CourseSite(site_config_from_args(args))
+    server, start_url = start_server(site)
+    base = start_url[: -len("/course/assets/")]
+    urls = [base + path for path in sorted(site.files) if path.endswith(".pdf")]
+    session = requests.Session()
+
+    try:
+        full_bytes = ranged_bytes = ranged_requests = fallbacks = mismatches = 0
+        full_time = ranged_time = 0.0
+        for url in urls:
+            started = time.perf_counter()
+            r = session.get(url, timeout=20)
+            r.raise_for_status()
+            expected, _ = trim_pdf(io.BytesIO(r.content), args.keep)
+            full_time += time.perf_counter() - started
+            full_bytes += len(r.content)
+
+            started = time.perf_counter()
+            data, stats = fetch_last_pages(url, args.keep, session, args.block_size)
+            ranged_time += time.perf_counter() - started
+            ranged_bytes += stats["fetched"]
+            ranged_requests += stats["requests"]
+            fallbacks += stats["mode"] == "full"
+            if footers(data) != footers(expected):
+                mismatches += 1
+                print("MISMATCH", url)
+    finally:
+        server.shutdown()
+
+    mb = 1024 * 1024
+    print(f"{len(urls)} PDFs of {args.pages} pages (~{args.deck_kb} KB), keeping the last {args.keep}, "
+          f"ranges {'on' if args.ranges else 'off'}")
+    print(f"{'method':<8} {'MB':>8} {'requests':>9} {'seconds':>8}")
+    print(f"{'full':<8} {full_bytes / mb:8.2f} {len(urls):9d} {full_time:8.2f}")
+    print(f"{'ranged':<8} {ranged_bytes / mb:8.2f} {ranged_requests:9d} {ranged_time:8.2f}")
+    if full_bytes:
+        print(f"Bytes saved: {(full_bytes - ranged_bytes) / mb:.2f} MB ({100 * (full_bytes - ranged_bytes) / full_bytes:.0f}%)")
+    print(f"Fell back to a full download: {fallbacks}/{len(urls)}")
+    print(f"Output matches the full-download trim: {'yes' if not mismatches else f'NO ({mismatches} differ)'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Benchmark: trimming PDFs to their last pages.
+
+Compares the original twopages.py approach (len(reader.pages) and
+reader.pages[i], which flattens the whole page tree) with pdf_pages.last_pages,
+which walks only the branch leading to the last N leaves. Reports time and
+peak Python memory per approach and checks that both write byte-identical
+output, first on small decks whose root /Count is missing or too low (where
+last_pages must fall back to the flattened pages). Point --corpus at a
+folder of real decks to benchmark the largest of them; without one, long
+synthetic decks are generated.
+
+Usage:
+    python benchmarks/bench_twopages.py --corpus downloaded_pdfs_new/ --largest 20
+    python benchmarks/bench_twopages.py --decks 10 --pages 400
+"""
+
+import argparse
+import io
+import os
+import re
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from pypdf import PdfReader, PdfWriter
+
+from course_site_server import make_pdf
+from pdf_pages import last_pages
+
+def trim_flatten(data: bytes, last: int) -> bytes:
+    """The original twopages.py loop."""
+    reader = PdfReader(io.BytesIO(data))
+    n = len(reader.pages)
+    writer = PdfWriter()
+    for i in range(max(0, n - last), n):
+        writer.add_page(reader.pages[i])
+    out = io.BytesIO()
+    writer.write(out)
+    return out.getvalue()
+
+def trim_tree(data: bytes, last: int) -> bytes:
+    reader = PdfReader(io.BytesIO(data))
+    pages, _ = last_pages(reader, last)
+    writer = PdfWriter()
+    for page in pages:
+        writer.add_page(page)
+    out = io.BytesIO()
+    writer.write(out)
+    return out.getvalue()
+
+APPROACHES = {
+    "flatten": trim_flatten,
+    "tree": trim_tree,
+}
+
+def malformed_decks():
+    """(name, PDF) with a damaged root /Count; the edits keep the byte length, so the xref stays valid."""
+    data = make_pdf("Malformed", 5, 1, 8)
+    count = re.search(rb"/Count 5\b", data)
+    def edit(replacement):
+        return data[:count.start()] + replacement + data[count.end():]
+    return [
+        ("missing /Count", edit(b"/Dummy 5")),
+        ("/Count 0", edit(b"/Count 0")),
+        ("/Count too low", edit(b"/Count 1")),
+    ]
+
+def check_malformed(last: int) -> bool:
+    ok = True
+    for name, data in malformed_decks():
+        reader = PdfReader(io.BytesIO(data))
+        _, total = last_pages(reader, last)
+        same = trim_tree(data, last) == trim_flatten(data, last)
+        if not same or total != 5:
+            print(f"{name}: last_pages gave {total} pages in, output {'identical' if same else 'DIFFERS'}")
+            ok = False
+    return ok
+
+def load_corpus(path: str, largest: int):
+    names = [n for n in os.listdir(path) if n.lower().endswith(".pdf")]
+    names.sort(key=lambda n: os.path.getsize(os.path.join(path, n)), reverse=True)
+    decks = []
+    for name in names[:largest]:
+        with open(os.path.join(path, name), "rb") as f:
+            decks.append(f.read())
+    return decks
+
+def run(trim, decks, last: int, repeat: int):
+    """(best seconds, peak traced bytes, outputs) over `repeat` passes."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        outputs = [trim(data, last) for data in decks]
+        best = min(best, time.perf_counter() - started)
+    tracemalloc.start()
+    for data in decks:
+        trim(data, last)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, outputs
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark last-pages trimming approaches.")
+    parser.add_argument("--corpus", help="Folder of PDFs; the largest are used (default: generate decks)")
+    parser.add_argument("--largest", type=int, default=20, help="How many of the corpus's largest PDFs (default: %(default)s)")
+    parser.add_argument("--decks", type=int, default=10, help="Generated decks (default: %(default)s)")
+    parser.add_argument("--pages", type=int, default=300, help="Pages per generated deck (default: %(default)s)")
+    parser.add_argument("--deck-kb", type=int, default=1024, help="Size of each generated deck (default: %(default)s)")
+    parser.add_argument("--last", type=int, default=2, help="Trailing pages to keep (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed passes; the best is kept (default: %(default)s)")
+    args = parser.parse_args()
+
+    if not check_malformed(args.last):
+        sys.exit(1)
+    if args.corpus:
+        decks = load_corpus(args.corpus, args.largest)
+    else:
+        decks = [make_pdf(f"Deck {i + 1}", args.pages, 1, args.deck_kb) for i in range(args.decks)]
+    if not decks:
+        print("No PDFs to benchmark.")
+        sys.exit(1)
+    total_pages = sum(len(PdfReader(io.BytesIO(d)).pages) for d in decks)
+    print(f"{len(decks)} PDFs, {total_pages} pages, {sum(map(len, decks)) / (1024 * 1024):.1f} MB, keeping the last {args.last}")
+
+    print(f"{'approach':<10} {'seconds':>8} {'files/s':>8} {'peak MB':>8}  output")
+    baseline = None
+    for name, trim in APPROACHES.items():
+        seconds, peak, outputs = run(trim, decks, args.last, args.repeat)
+        if baseline is None:
+            baseline = outputs
+            same = "baseline"
+        else:
+            same = "identical" if outputs == baseline else "DIFFERS"
+        print(f"{name:<10} {seconds:8.3f} {len(decks) / seconds:8.1f} {peak / (1024 * 1024):8.2f}  {same}")
+
+if __name__ == "__main__":
+    main()
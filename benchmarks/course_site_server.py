@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the course site, built on http.server.
+
+Serves a synthetic copy of the slide site that scra.py crawls:
+
+    /course/assets/                 Apache-style directory listing
+    /course/assets/sec_1/           nested listings, --depth levels deep
+    .../<id>.js                     viewer asset: local_pdf({"pdf": "JVBERi0..."})
+    .../<id>.pdf                    direct PDF download
+    .../<id>.png                    large binary noise (what --probe should skip)
+
+Every PDF is a real (small, uncompressed) PDF with --pages slides, each
+carrying a page-number footer like the real decks. Latency and 503 errors
+can be injected, ETag / If-None-Match is supported so --recrawl runs see
+304s, and single byte ranges are served with 206 unless --no-ranges.
+
+Usage:
+    python benchmarks/course_site_server.py --port 8000 --decks 40 --pdfs 10
+    python3 scra.py --start-url http://127.0.0.1:8000/course/assets/
+"""
+
+import argparse
+import base64
+import hashlib
+import random
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = "/course/assets/"
+
+@dataclass
+class SiteConfig:
+    decks: int = 40  # embedded local_pdf({...}) assets
+    pdfs: int = 10  # direct PDF downloads
+    duplicates: int = 2  # direct PDFs also linked from a second directory
+    noise: int = 5  # large binary files that hold no slides
+    noise_kb: int = 512
+    pages: int = 6  # slides per deck
+    deck_kb: int = 64  # rough size of each PDF
+    depth: int = 2  # levels of nested listings below ROOT
+    fanout: int = 3  # subdirectories per listing
+    latency: float = 0.0  # seconds added to every response
+    jitter: float = 0.0  # up to this many extra seconds, uniformly random
+    error_rate: float = 0.0  # share of requests answered with 503
+    ranges: bool = True  # honour Range: bytes=... requests with 206
+    seed: int = 1
+
+def make_pdf(title: str, pages: int, first_page_number: int = 1, size_kb: int = 0) -> bytes:
+    """A valid uncompressed PDF with one text slide per page and a page-number footer."""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        ("<< /Type /Pages /Kids [%s] /Count %d >>"
+         % (" ".join(f"{4 + 2 * i} 0 R" for i in range(pages)), pages)).encode(),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    # pad each content stream with a PDF comment so the file reaches size_kb
+    padding = max(0, size_kb * 1024 // max(pages, 1) - 200)
+    for i in range(pages):
+        content = (
+            f"BT /F1 24 Tf 72 700 Td ({title} - slide {i + 1}) Tj ET\n"
+            f"BT /F1 14 Tf 72 650 Td (Glava {i + 1}) Tj ET\n"
+            f"BT /F1 12 Tf 540 40 Td ( {first_page_number + i}) Tj ET\n"
+        ).encode()
+        if padding:
+            content += b"% " + b"x" * padding + b"\n"
+        objects.append(
+            (f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+             f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>").encode()
+        )
+        objects.append(b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream")
+
+    out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+def parse_range(header: str, size: int):
+    """(start, end) inclusive for a single "bytes=" range, None to ignore it, or () if unsatisfiable."""
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    first, _, last = header[len("bytes="):].strip().partition("-")
+    try:
+        if not first:
+            length = int(last)
+            if length <= 0:
+                return ()
+            return max(0, size - length), size - 1
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        return None
+    if start >= size or end < start:
+        return ()
+    return start, min(end, size - 1)
+
+def listing_html(path: str, entries) -> bytes:
+    rows = "\n".join(
+        f'<tr><td valign="top"><img src="/icons/unknown.gif" alt="[   ]"></td>'
+        f'<td><a href="{name}">{name}</a></td><td align="right">2024-03-01 10:00  </td></tr>'
+        for name in entries
+    )
+    return (
+        "<!DOCTYPE HTML PUBLIC \"-//W3C//DTD HTML 3.2 Final//EN\">\n<html>\n <head>\n"
+        f"  <title>Index of {path}</title>\n </head>\n <body>\n<h1>Index of {path}</h1>\n<table>\n"
+        "<tr><th><a href=\"?C=N;O=D\">Name</a></th><th><a href=\"?C=M;O=A\">Last modified</a></th></tr>\n"
+        "<tr><td><a href=\"../\">Parent Directory</a></td></tr>\n"
+        f"{rows}\n</table>\n</body></html>\n"
+    ).encode()
+
+class CourseSite:
+    """All files of the synthetic site, generated up front: path -> (content type, body)."""
+
+    def __init__(self, config: SiteConfig):
+        self.config = config
+        self.files = {}
+        rng = random.Random(config.seed)
+
+        # directory tree
+        leaves = [ROOT]
+        listings = {ROOT: []}
+        for _ in range(config.depth):
+            next_leaves = []
+            for parent in leaves:
+                for k in range(1, config.fanout + 1):
+                    child = f"{parent}sec_{k}/"
+                    listings[parent].append(f"sec_{k}/")
+                    listings[child] = []
+                    next_leaves.append(child)
+            leaves = next_leaves
+
+        def place(i, name, content_type, body):
+            directory = leaves[i % len(leaves)]
+            listings[directory].append(name)
+            self.files[directory + name] = (content_type, body)
+            return directory + name
+
+        self.pdf_count = 0
+        page = 1
+        for i in range(config.decks):
+            pdf = make_pdf(f"Predavanje {i + 1}", config.pages, page, config.deck_kb)
+            page += config.pages
+            asset = b'local_pdf({"name": "deck %d", "pdf": "' % (i + 1) + base64.b64encode(pdf) + b'"});\n'
+            place(i, f"{rng.getrandbits(64):016x}.js", "application/javascript", asset)
+            self.pdf_count += 1
+        direct = []
+        for i in range(config.pdfs):
+            pdf = make_pdf(f"Dodatak {i + 1}", config.pages, page, config.deck_kb)
+            page += config.pages
+            name = f"{rng.getrandbits(64):016x}.pdf"
+            direct.append((name, pdf))
+            place(config.decks + i, name, "application/pdf", pdf)
+            self.pdf_count += 1
+        for i in range(min(config.duplicates, len(direct))):
+            name, pdf = direct[i]
+            place(config.decks + i + 1, "copy_" + name, "application/pdf", pdf)
+        for i in range(config.noise):
+            place(i, f"{rng.getrandbits(64):016x}.png", "image/png", rng.randbytes(config.noise_kb * 1024))
+
+        for path, entries in listings.items():
+            self.files[path] = ("text/html; charset=utf-8", listing_html(path, entries))
+        self.total_bytes = sum(len(body) for _, body in self.files.values())
+        self.etags = {path: '"%s"' % hashlib.sha1(body).hexdigest() for path, (_, body) in self.files.items()}
+        self.rng = rng
+        self.rng_lock = threading.Lock()
+
+    def roll(self):
+        """(delay, fail) for one request."""
+        with self.rng_lock:
+            delay = self.config.latency + self.rng.uniform(0, self.config.jitter)
+            fail = self.rng.random() < self.config.error_rate
+        return delay, fail
+
+def make_handler(site: CourseSite):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            self.respond(send_body=True)
+
+        def do_HEAD(self):
+            self.respond(send_body=False)
+
+        def respond(self, send_body):
+            delay, fail = site.roll()
+            if delay:
+                time.sleep(delay)
+            path = self.path.split("?", 1)[0].split("#", 1)[0]
+            if fail:
+                return self.send_plain(503, b"injected error\n", send_body)
+            if path not in site.files:
+                return self.send_plain(404, b"not found\n", send_body)
+            content_type, body = site.files[path]
+            etag = site.etags[path]
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            byte_range = parse_range(self.headers.get("Range"), len(body)) if site.config.ranges else None
+            if byte_range == ():
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{len(body)}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            if byte_range:
+                start, end = byte_range
+                self.send_response(206)
+                self.send_header("Content-Range", f"bytes {start}-{end}/{len(body)}")
+                body = body[start:end + 1]
+            else:
+                self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            if site.config.ranges:
+                self.send_header("Accept-Ranges", "bytes")
+            self.end_headers()
+            if send_body:
+                self.wfile.write(body)
+
+        def send_plain(self, status, body, send_body):
+            self.send_response(status)
+            self.send_header("Content-Type", "text/plain")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if send_body:
+                self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+class SiteServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # clients that hang up early (e.g. after a --probe) are not errors
+        if isinstance(sys.exc_info()[1], (ConnectionResetError, BrokenPipeError)):
+            return
+        super().handle_error(request, client_address)
+
+def start_server(site: CourseSite, host: str = "127.0.0.1", port: int = 0):
+    """Serve site on a background thread. Returns (server, start URL); call server.shutdown() when done."""
+    server = SiteServer((host, port), make_handler(site))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://{host}:{server.server_address[1]}{ROOT}"
+
+def add_site_arguments(parser):
+    defaults = SiteConfig()
+    for field, value in vars(defaults).items():
+        if isinstance(value, bool):
+            parser.add_argument("--no-" + field.replace("_", "-"), dest=field, action="store_false",
+                                help=f"Turn off {field}")
+            continue
+        parser.add_argument("--" + field.replace("_", "-"), type=type(value), default=value,
+                            help=f"(default: {value})")
+
+def site_config_from_args(args) -> SiteConfig:
+    return SiteConfig(**{field: getattr(args, field) for field in vars(SiteConfig())})
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a synthetic copy of the course site.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    add_site_arguments(parser)
+    args = parser.parse_args()
+
+    site = CourseSite(site_config_from_args(args))
+    server, url = start_server(site, args.host, args.port)
+    print(f"Serving {len(site.files)} files ({site.total_bytes / (1024 * 1024):.1f} MB, "
+          f"{site.pdf_count} distinct PDFs) at {url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+        sys.exit(0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Skip-if-unchanged bookkeeping for the file-to-file pipeline stages.
+
+twopages.py and extract_pdf_text.py share one build_manifest.json. It has a
+section per stage and output directory, and in it one entry per input:
+
+    "twopages:last_two_pages": {
+        "downloaded_pdfs_new/deck.pdf": {
+            "sha256": ..., "size": 2483311, "mtime_ns": ...,
+            "tool": "twopages/2 pypdf/6.2.0", "params": {"last": 2},
+            "output": "last_two_pages/deck_last2.pdf", "output_size": 81234}}
+
+An input is up to date when its content hash, the tool version and the
+parameters all match and its output is still on disk at the recorded size.
+The hash is only recomputed when the input's size or mtime changed.
+Entries whose input file is gone have their output deleted by
+remove_orphans(), and record() deletes an input's previous output when its
+output name changes (twopages.py --last 2 -> 3 renames _last2 to _last3).
+mark_stale() (--force) rebuilds every input but keeps the entries, so both
+still happen on a forced run.
+"""
+
+import hashlib
+import json
+import os
+
+BUILD_MANIFEST = "build_manifest.json"
+HASH_CHUNK = 1024 * 1024
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class BuildManifest:
+    def __init__(self, stage: str, out_dir: str, tool: str, params=None, path: str = BUILD_MANIFEST):
+        self.path = path
+        self.section = f"{stage}:{os.path.normpath(out_dir)}"
+        self.tool = tool
+        self.params = params or {}
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f).get("stages", {}).get(self.section, {})
+        self._fingerprints = {}
+        self.force = False
+
+    def mark_stale(self):
+        """Treat every entry as out of date and rehash every input; the entries are kept."""
+        self.force = True
+
+    def fingerprint(self, inpath: str) -> dict:
+        """sha256/size/mtime_ns of inpath, reusing the recorded hash when size and mtime match."""
+        key = os.path.normpath(inpath)
+        if key not in self._fingerprints:
+            st = os.stat(inpath)
+            entry = self.entries.get(key, {})
+            if not self.force and entry.get("size") == st.st_size and entry.get("mtime_ns") == st.st_mtime_ns:
+                sha = entry["sha256"]
+            else:
+                sha = file_sha256(inpath)
+            self._fingerprints[key] = {"sha256": sha, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+        return self._fingerprints[key]
+
+    def is_fresh(self, inpath: str, outpath: str) -> bool:
+        entry = self.entries.get(os.path.normpath(inpath))
+        if not entry or self.force:
+            return False
+        if entry.get("tool") != self.tool or entry.get("params") != self.params:
+            return False
+        if entry.get("output") != os.path.normpath(outpath):
+            return False
+        try:
+            if os.path.getsize(outpath) != entry.get("output_size"):
+                return False
+        except OSError:
+            return False
+        return entry.get("sha256") == self.fingerprint(inpath)["sha256"]
+
+    def record(self, inpath: str, outpath: str):
+        """
+        Mark outpath as built from the current inpath (no-op if the output was not written).
+
+        If inpath was recorded with a different output, that file is deleted;
+        returns its path, or None.
+        """
+        if not os.path.exists(outpath):
+            return None
+        key = os.path.normpath(inpath)
+        previous = self.entries.get(key, {}).get("output")
+        replaced = None
+        if previous and previous != os.path.normpath(outpath) and os.path.exists(previous):
+            os.remove(previous)
+            replaced = previous
+        self.entries[key] = {
+            **self.fingerprint(inpath),
+            "tool": self.tool,
+            "params": self.params,
+            "output": os.path.normpath(outpath),
+            "output_size": os.path.getsize(outpath),
+        }
+        return replaced
+
+    def forget(self, inpath: str):
+        self.entries.pop(os.path.normpath(inpath), None)
+
+    def remove_orphans(self) -> list:
+        """Delete outputs whose input no longer exists. Returns the removed output paths."""
+        removed = []
+        for inpath, entry in list(self.entries.items()):
+            if os.path.exists(inpath):
+                continue
+            output = entry.get("output")
+            if output and os.path.exists(output):
+                os.remove(output)
+                removed.append(output)
+            del self.entries[inpath]
+        return removed
+
+    def save(self):
+        # re-read so a stage that ran meanwhile keeps its section
+        sections = {}
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                sections = json.load(f).get("stages", {})
+        sections[self.section] = self.entries
+        tmp = self.path + ".tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({"stages": sections}, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.path)
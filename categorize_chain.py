@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+The whole categorization chain in one process, on one Corpus.
+
+Does what these scripts do when run one after another, without the
+ordered_text_units*/ directories and JSON files they pass along:
+
+    extract_units.py                  units of the table-of-contents pages
+    add_unit_name_prefix_v2.py        UNIT NAME: tags
+    count_unit_names.py               pages with more than one tag
+    categorize_files.py               categories.json (sort_filenames_in_json.py is
+                                      not needed: pages are kept in page order)
+    create_hierarchical_categories.py
+    group_consecutive_uncategorized.py
+    fix_chapter_boundaries.py         hierarchical_categories_fixed.json
+
+The hierarchy is built from --human (the reviewed humancategories.json) if
+given, otherwise from the categories just computed. Each stage's time is
+printed at the end.
+
+Usage:
+    python categorize_chain.py                                    # ordered_text_page1_only/
+    python categorize_chain.py data.pack --human intermediate_files/humancategories.json
+    python categorize_chain.py --tagged-dir data/ --units-dir ordered_unit_files/
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from add_unit_name_prefix_v2 import tag_pages
+from categorize_files import categorize_files
+from corpus import Corpus, write_pages
+from count_unit_names import pages_with_several_unit_names
+from create_hierarchical_categories import create_hierarchical_json
+from extract_units import extract_chapters
+from fix_chapter_boundaries import fix_chapter_boundaries
+from group_consecutive_uncategorized import group_consecutive_uncategorized
+
+SOURCE = 'ordered_text_page1_only'
+CATEGORIES = 'categories.json'
+HIERARCHY = 'hierarchical_categories_fixed.json'
+
+class StageTimer:
+    def __init__(self):
+        self.stages = []
+
+    @contextmanager
+    def stage(self, name):
+        started = time.perf_counter()
+        yield
+        self.stages.append((name, time.perf_counter() - started))
+
+    def report(self):
+        total = sum(seconds for _, seconds in self.stages)
+        print("\nStage timings:")
+        for name, seconds in self.stages:
+            print(f"  {name:<14} {seconds * 1000:8.1f} ms")
+        print(f"  {'total':<14} {total * 1000:8.1f} ms")
+
+def write_json(data, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+def run_chain(source, human=None, timer=None, quiet=False):
+    """
+    Run every stage on the page texts in source (a directory or a pack).
+
+    Returns (corpus, unit pages, categories, hierarchy); the corpus pages
+    are tagged in place.
+    """
+    timer = timer or StageTimer()
+    with timer.stage("load"):
+        corpus = Corpus.load(source)
+    with timer.stage("units"):
+        unit_pages = extract_chapters(corpus)
+    with timer.stage("tag"):
+        tag_pages(corpus, set(corpus.units))
+    with timer.stage("count"):
+        several = pages_with_several_unit_names(corpus)
+    with timer.stage("categorize"):
+        categories = categorize_files(corpus)
+    if human:
+        with open(human, 'r', encoding='utf-8') as f:
+            flat = json.load(f, object_pairs_hook=OrderedDict)
+    else:
+        flat = categories
+    # the hierarchy stages print their own progress, as the scripts do
+    stdout = sys.stdout
+    if quiet:
+        sys.stdout = open(os.devnull, 'w')
+    try:
+        with timer.stage("hierarchy"):
+            hierarchy = create_hierarchical_json(flat, corpus.chapters, corpus.numbers())
+        with timer.stage("group"):
+            hierarchy = group_consecutive_uncategorized(hierarchy)
+        with timer.stage("boundaries"):
+            hierarchy = fix_chapter_boundaries(hierarchy, corpus.chapters, corpus.numbers())
+    finally:
+        if quiet:
+            sys.stdout.close()
+            sys.stdout = stdout
+    for name, count in several:
+        print(f"{name}: {count} UNIT NAME lines")
+    return corpus, unit_pages, categories, hierarchy
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the categorization chain in one process.")
+    parser.add_argument("source", nargs="?", default=SOURCE,
+                        help="Page 1 texts: a directory or a packed_corpus.py pack (default: %(default)s)")
+    parser.add_argument("--human", help="Reviewed categories to build the hierarchy from (default: the computed ones)")
+    parser.add_argument("--categories", default=CATEGORIES, help="Output categories (default: %(default)s)")
+    parser.add_argument("--hierarchy", default=HIERARCHY, help="Output hierarchy (default: %(default)s)")
+    parser.add_argument("--tagged-dir", help="Also write the tagged pages here (what data/ holds)")
+    parser.add_argument("--units-dir", help="Also write the unit files here (what ordered_unit_files/ holds)")
+    parser.add_argument("--verbose", action="store_true", help="Show the hierarchy stages' own output")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.source):
+        print(f"Error: '{args.source}' not found.")
+        sys.exit(1)
+    timer = StageTimer()
+    corpus, unit_pages, categories, hierarchy = run_chain(args.source, args.human, timer, quiet=not args.verbose)
+    with timer.stage("write"):
+        write_json(categories, args.categories)
+        write_json(hierarchy, args.hierarchy)
+        if args.tagged_dir:
+            write_pages(corpus, args.tagged_dir)
+        if args.units_dir:
+            write_pages(unit_pages, args.units_dir)
+
+    categorized = sum(len(files) for files in categories.values())
+    print(f"{len(corpus)} pages, {len(corpus.chapters)} chapters, {len(categories)} units, {categorized} pages categorized")
+    print(f"Saved {args.categories} and {args.hierarchy}")
+    timer.report()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Unit extraction, UNIT NAME tagging and categorization in one streaming stage.
+
+extract_units.py, add_unit_name_prefix_v2.py and categorize_files.py hand
+their results to each other through ordered_text_units/ and
+ordered_text_units_named/, each reading every page again. This does the
+same in two passes over the pages:
+
+    1. the table-of-contents pages (a "Glava N" line) are found by searching
+       the raw bytes of every page for "Glava "; only those are decoded and
+       their units added to the unit index: unit name -> Unit, in
+       table-of-contents order
+    2. every page is read once, in page order: its lines that are unit names
+       are prefixed with "UNIT NAME: ", it is written to the tagged
+       directory, and filed under the unit of its first UNIT NAME line
+
+then writes categories.json. The index is complete before any page is
+tagged, so a page that names a unit of a later chapter (page 345 names
+Destruktor, from Glava 12's table of contents on page 348) is tagged as
+add_unit_name_prefix_v2.py tags it, and the output is the same as the three
+scripts'. Only the current page and the index are kept.
+
+Usage:
+    python categorize_stream.py                        # ordered_text_page1_only/
+    python categorize_stream.py data.pack --tagged-dir data/ --units-dir ordered_unit_files/
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from collections import OrderedDict
+
+from corpus import Chapter, Page, Unit, find_pages, iter_page_texts, text_lines, write_page
+from extract_units import extract_units
+
+SOURCE = 'ordered_text_page1_only'
+TAGGED_DIR = 'ordered_text_units_named'
+CATEGORIES = 'categories.json'
+
+UNIT_PREFIX = 'UNIT NAME: '
+# a superset of the pages extract_units() finds a 'Glava N' line in; it decides
+GLAVA_RE = re.compile(rb'Glava ')
+
+class UnitIndex:
+    """
+    Chapters in page order and unit name -> Unit, first chapter wins (as Corpus.set_chapters()).
+
+    A Unit's pages are the file names filed under it; the pages themselves
+    are not kept.
+    """
+
+    def __init__(self):
+        self.chapters = []
+        self.units = OrderedDict()
+
+    def add_chapter(self, chapter):
+        self.chapters.append(chapter)
+        for name in chapter.units:
+            if name not in self.units:
+                self.units[name] = Unit(name, chapter)
+
+    def categories(self):
+        """What categorize_files() returns: unit name -> file names, every unit present."""
+        return OrderedDict((name, unit.pages) for name, unit in self.units.items())
+
+def tag_and_file(lines, units):
+    """
+    add_unit_name_prefix_v2.tag_lines() and the categorize_files() lookup in one loop.
+
+    Returns the tagged lines and the Unit of the first UNIT NAME line (None
+    if there is none, or its name is not a unit).
+    """
+    tagged = []
+    unit = None
+    filed = False
+    for line in lines:
+        line = line.rstrip()
+        name = line.lstrip()
+        if name in units:
+            line = UNIT_PREFIX + name
+            if not filed:
+                filed = True
+                unit = units[name]
+        elif not filed and name.startswith(UNIT_PREFIX):
+            # already tagged in the source
+            filed = True
+            unit = units.get(name[len(UNIT_PREFIX):].strip())
+        tagged.append(line)
+    return tagged, unit
+
+def build_index(source, units_dir=None):
+    """
+    The UnitIndex of the table-of-contents pages of source (a directory or a pack).
+
+    Writes their unit pages (what extract_units.py writes) to units_dir, if given.
+    """
+    index = UnitIndex()
+    if units_dir:
+        os.makedirs(units_dir, exist_ok=True)
+    for number, name, text in find_pages(source, GLAVA_RE):
+        units = extract_units(text_lines(text))
+        if units is not None:
+            unit_page = Page(number, name, units)
+            index.add_chapter(Chapter.from_unit_lines(number, unit_page.lines))
+            if units_dir:
+                write_page(unit_page, units_dir)
+    return index
+
+def categorize_stream(source, tagged_dir=None, units_dir=None):
+    """
+    Build the unit index of source, then tag and file every page in one pass.
+
+    Writes the tagged pages to tagged_dir and the unit pages to units_dir,
+    if given. Returns the UnitIndex, its Units holding the pages filed under
+    them.
+    """
+    index = build_index(source, units_dir)
+    if tagged_dir:
+        os.makedirs(tagged_dir, exist_ok=True)
+    for number, name, text in iter_page_texts(source):
+        tagged, unit = tag_and_file(text_lines(text), index.units)
+        if unit is not None:
+            unit.pages.append(name)
+        if tagged_dir:
+            write_page(Page(number, name, tagged), tagged_dir)
+    return index
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract units, then tag and categorize the pages in one pass.")
+    parser.add_argument("source", nargs="?", default=SOURCE,
+                        help="Page 1 texts: a directory or a packed_corpus.py pack (default: %(default)s)")
+    parser.add_argument("--tagged-dir", default=TAGGED_DIR, help="Output directory for the tagged pages (default: %(default)s)")
+    parser.add_argument("--units-dir", help="Also write the unit files here (what extract_units.py writes)")
+    parser.add_argument("--categories", default=CATEGORIES, help="Output categories (default: %(default)s)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.source):
+        print(f"Error: '{args.source}' not found.")
+        sys.exit(1)
+    started = time.perf_counter()
+    index = categorize_stream(args.source, args.tagged_dir, args.units_dir)
+    categories = index.categories()
+    with open(args.categories, 'w', encoding='utf-8') as f:
+        json.dump(categories, f, ensure_ascii=False, indent=2)
+    elapsed = time.perf_counter() - started
+
+    categorized = sum(len(files) for files in categories.values())
+    print(f"{len(index.chapters)} chapters, {len(categories)} units, {categorized} pages categorized")
+    print(f"Saved {args.tagged_dir}/ and {args.categories} in {elapsed * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+In-memory page corpus shared by the categorization scripts.
+
+extract_units.py, add_unit_name_prefix_v2.py, count_unit_names.py,
+categorize_files.py, create_hierarchical_categories.py and
+fix_chapter_boundaries.py all work on page_XXXX_extracted_text.txt files.
+Corpus.load() reads such a directory (or a packed_corpus.py pack) once:
+
+    Page     one file: its page number, file name and lines (newlines stripped,
+             as `for line in f` plus rstrip('\\n') gives them)
+    Chapter  a table-of-contents page: its "Glava N: ..." title and its units
+    Unit     a "❖ " unit name, its chapter, and the pages categorized under it
+
+Pages are kept in page order, and corpus.units maps each unit name to its
+Unit in table-of-contents order. categorize_chain.py runs the whole
+chain on one Corpus, in one process. iter_pages() reads the same sources
+one page at a time and find_pages() picks out pages by their raw bytes, for
+categorize_stream.py.
+"""
+
+import os
+from collections import OrderedDict
+
+from packed_corpus import PAGE_FILE_RE, PackedCorpus, page_filename
+
+def text_lines(text: str) -> list:
+    """The lines of text as iterating over the file would give them, without their newlines."""
+    if "\r" in text:  # what universal newline mode does on read
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    lines = text.split("\n")
+    if lines[-1] == "":
+        lines.pop()
+    return lines
+
+class Page:
+    __slots__ = ("number", "name", "lines")
+
+    def __init__(self, number: int, name: str, lines: list):
+        self.number = number
+        self.name = name
+        self.lines = lines
+
+    def __repr__(self):
+        return f"Page({self.number}, {self.name!r})"
+
+class Unit:
+    __slots__ = ("name", "chapter", "pages")
+
+    def __init__(self, name: str, chapter=None):
+        self.name = name
+        self.chapter = chapter
+        self.pages = []
+
+    def __repr__(self):
+        return f"Unit({self.name!r}, {len(self.pages)} pages)"
+
+class Chapter:
+    __slots__ = ("title", "page", "units")
+
+    def __init__(self, title, page: int, units: list):
+        self.title = title
+        self.page = page
+        self.units = units
+
+    @classmethod
+    def from_unit_lines(cls, page: int, lines: list):
+        """
+        A chapter from the lines of an ordered_unit_files/ file (what extract_units.py writes).
+
+        Like the scripts reading those files, the title is the last line
+        starting with "Glava " (None if there is none) and the units are the
+        lines starting with "❖ ", stripped.
+        """
+        title = None
+        units = []
+        for line in lines:
+            line = line.strip()
+            if line.startswith('Glava '):
+                title = line
+            elif line.startswith('❖ '):
+                name = line[2:].strip()
+                if name:
+                    units.append(name)
+        return cls(title, page, units)
+
+    def __repr__(self):
+        return f"Chapter({self.title!r}, page {self.page}, {len(self.units)} units)"
+
+class Corpus:
+    """Pages in page order, plus the chapters and unit index once set_chapters() has run."""
+
+    def __init__(self, pages):
+        self.pages = sorted(pages, key=lambda page: page.number)
+        self.by_number = {page.number: page for page in self.pages}
+        self.chapters = []
+        self.units = OrderedDict()
+
+    @classmethod
+    def load(cls, source: str):
+        """Read a directory of page_XXXX_extracted_text.txt files, or a pack file, in one pass."""
+        return cls(iter_pages(source))
+
+    def __len__(self):
+        return len(self.pages)
+
+    def __iter__(self):
+        return iter(self.pages)
+
+    def numbers(self) -> set:
+        return set(self.by_number)
+
+    def set_chapters(self, chapters):
+        """Use these chapters (in page order); unit names are indexed in order, first chapter wins."""
+        self.chapters = list(chapters)
+        self.units = OrderedDict()
+        for chapter in self.chapters:
+            for name in chapter.units:
+                if name not in self.units:
+                    self.units[name] = Unit(name, chapter)
+
+    def chapters_from_unit_pages(self):
+        """Treat every page as an ordered_unit_files/ file and set the chapters from them."""
+        self.set_chapters(Chapter.from_unit_lines(page.number, page.lines) for page in self.pages)
+        return self.chapters
+
+def iter_page_texts(source: str):
+    """
+    (page number, file name, text) for every page of a directory or a pack, in page order.
+
+    Lazy: each text is read only when it is reached, so a caller that does
+    not keep them holds one page at a time.
+    """
+    if os.path.isfile(source):
+        with PackedCorpus(source) as pack:
+            for number in pack.pages:
+                yield number, page_filename(number), pack.text(number)
+        return
+    for number, name in _page_files(source):
+        with open(os.path.join(source, name), 'r', encoding='utf-8') as f:
+            yield number, name, f.read()
+
+def find_pages(source: str, pattern):
+    """
+    (page number, file name, text) for the pages whose raw bytes match pattern, in page order.
+
+    pattern is a compiled bytes regex; the other pages are searched but not
+    decoded. Compare the text further to be sure, as it is line-ending
+    normalized and the bytes are not.
+    """
+    if os.path.isfile(source):
+        with PackedCorpus(source) as pack:
+            for number in pack.pages:
+                data = pack.page_bytes(number)
+                text = str(data, 'utf-8') if pattern.search(data) else None
+                data.release()  # the pack cannot be closed while a page view is alive
+                if text is not None:
+                    yield number, page_filename(number), text
+        return
+    for number, name in _page_files(source):
+        with open(os.path.join(source, name), 'rb') as f:
+            data = f.read()
+        if pattern.search(data):
+            yield number, name, str(data, 'utf-8')
+
+def page_numbers(source: str) -> set:
+    """The page numbers of a directory (from the file names) or a pack (from its index); no page is read."""
+    if os.path.isfile(source):
+        with PackedCorpus(source) as pack:
+            return set(pack.pages)
+    return {number for number, _ in _page_files(source)}
+
+def _page_files(directory: str) -> list:
+    """(page number, file name) of the page_XXXX_extracted_text.txt files in directory, sorted."""
+    names = []
+    for name in os.listdir(directory):
+        match = PAGE_FILE_RE.match(name)
+        if match:
+            names.append((int(match.group(1)), name))
+    names.sort()
+    return names
+
+def iter_pages(source: str):
+    """iter_page_texts() as Page objects."""
+    for number, name, text in iter_page_texts(source):
+        yield Page(number, name, text_lines(text))
+
+def page_number(filename: str):
+    """21 for "page_0021_extracted_text.txt"; None for any other name."""
+    match = PAGE_FILE_RE.match(filename)
+    return int(match.group(1)) if match else None
+
+def write_page(page, out_dir: str):
+    """Write page as out_dir/<its name>, a newline after every line."""
+    with open(os.path.join(out_dir, page.name), 'w', encoding='utf-8') as f:
+        f.write(''.join(line + '\n' for line in page.lines))
+
+def write_pages(pages, out_dir: str):
+    os.makedirs(out_dir, exist_ok=True)
+    for page in pages:
+        write_page(page, out_dir)
@@ -1,26 +1,27 @@
-import os
+from corpus import Corpus
 
 SRC_DIR = 'ordered_text_units_named'
 
-def count_unit_names_in_file(file_path):
+def count_unit_names(lines):
     count = 0
-    with open(file_path, 'r', encoding='utf-8') as f:
-        for line in f:
-            if line.startswith('UNIT NAME:'):
-                count += 1
+    for line in lines:
+        if line.startswith('UNIT NAME:'):
+            count += 1
     return count
 
-def main():
+def pages_with_several_unit_names(corpus):
+    """(file name, count) for every page with more than one UNIT NAME line."""
     results = []
-    for fname in os.listdir(SRC_DIR):
-        if fname.endswith('.txt'):
-            file_path = os.path.join(SRC_DIR, fname)
-            count = count_unit_names_in_file(file_path)
-            results.append((fname, count))
+    for page in corpus:
+        count = count_unit_names(page.lines)
+        if count > 1:
+            results.append((page.name, count))
+    return results
+
+def main():
     # Print results
-    for fname, count in results:
-        
-        if count>1: print(f'{fname}: {count}')
+    for fname, count in pages_with_several_unit_names(Corpus.load(SRC_DIR)):
+        print(f'{fname}: {count}')
 
 if __name__ == '__main__':
     main()
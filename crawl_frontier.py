@@ -0,0 +1,134 @@
+"""
+Persistent crawl frontier for scra.py.
+
+Every URL the crawler has queued or visited is a row in a small SQLite
+database, so a crawl that crashes or is interrupted can be picked up again
+with `python3 scra.py --resume`. Writes are committed in batches; at most
+the last batch is lost (and re-fetched) after a crash.
+"""
+
+import sqlite3
+
+# url states
+QUEUED = 0
+IN_FLIGHT = 1
+VISITED = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS urls (
+    url      TEXT PRIMARY KEY,
+    state    INTEGER NOT NULL,
+    seq      INTEGER NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+class CrawlFrontier:
+    """
+    SQLite-backed replacement for the in-memory `seen` set and `to_visit` stack.
+
+    pop() returns the queued URL with the highest priority; among equal
+    priorities the most recently pushed one wins (DFS, like the old list).
+    With every priority left at 0 this is exactly the old stack. Pushing a URL
+    that is already queued moves it back to the top of the stack, which is
+    what appending it to the list again used to do. The row counts
+    are kept in memory, so len() stays O(1) however large the frontier gets.
+    """
+
+    def __init__(self, path: str, resume: bool = False, flush_every: int = 200):
+        self.path = path
+        self.flush_every = flush_every
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(urls)")]
+        if "priority" not in columns:
+            # state file from before the frontier was prioritised
+            self.conn.execute("ALTER TABLE urls ADD COLUMN priority INTEGER NOT NULL DEFAULT 0")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS urls_best ON urls (state, priority, seq)")
+        if not resume:
+            self.conn.execute("DELETE FROM urls")
+            self.conn.execute("DELETE FROM meta")
+        else:
+            # whatever was in flight when we stopped never got its result recorded
+            self.conn.execute("UPDATE urls SET state = ? WHERE state = ?", (QUEUED, IN_FLIGHT))
+        self.conn.commit()
+
+        self.count = self.conn.execute("SELECT COUNT(*) FROM urls").fetchone()[0]
+        self.queued = self.conn.execute("SELECT COUNT(*) FROM urls WHERE state = ?", (QUEUED,)).fetchone()[0]
+        self.seq = self.conn.execute("SELECT COALESCE(MAX(seq), 0) FROM urls").fetchone()[0]
+        self.downloaded = int(self.get_meta("downloaded", 0))
+        self._dirty = 0
+
+    def __len__(self):
+        """Number of distinct URLs ever queued (visited or not)."""
+        return self.count
+
+    @property
+    def visited(self):
+        return self.count - self.queued
+
+    def get_meta(self, key, default=None):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key, value):
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+        self._touch()
+
+    def push(self, url: str, priority: int = 0) -> bool:
+        """Queue url unless it was already visited. Returns False if it was."""
+        row = self.conn.execute("SELECT state FROM urls WHERE url = ?", (url,)).fetchone()
+        if row is not None and row[0] != QUEUED:
+            return False
+        self.seq += 1
+        if row is None:
+            self.conn.execute(
+                "INSERT INTO urls (url, state, seq, priority) VALUES (?, ?, ?, ?)",
+                (url, QUEUED, self.seq, priority),
+            )
+            self.count += 1
+            self.queued += 1
+        else:
+            self.conn.execute(
+                "UPDATE urls SET seq = ?, priority = MAX(priority, ?) WHERE url = ?", (self.seq, priority, url)
+            )
+        self._touch()
+        return True
+
+    def pop(self):
+        """Take the best queued URL and mark it in flight, or return None."""
+        row = self.conn.execute(
+            "SELECT url FROM urls WHERE state = ? ORDER BY priority DESC, seq DESC LIMIT 1", (QUEUED,)
+        ).fetchone()
+        if row is None:
+            return None
+        self.conn.execute("UPDATE urls SET state = ? WHERE url = ?", (IN_FLIGHT, row[0]))
+        self.queued -= 1
+        self._touch()
+        return row[0]
+
+    def mark_done(self, url: str, saved: bool = False):
+        self.conn.execute("UPDATE urls SET state = ? WHERE url = ?", (VISITED, url))
+        if saved:
+            self.downloaded += 1
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('downloaded', ?)", (str(self.downloaded),)
+            )
+        self._touch()
+
+    def _touch(self):
+        self._dirty += 1
+        if self._dirty >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        self.conn.commit()
+        self._dirty = 0
+
+    def close(self):
+        self.flush()
+        self.conn.close()
@@ -0,0 +1,92 @@
+"""
+HTTP validator cache for incremental recrawls of the course site.
+
+For every URL scra.py fetches, the manifest keeps the ETag and Last-Modified
+headers, the SHA-256 of the body, the files it produced and (for HTML pages)
+the links it contained. With `scra.py --recrawl` the next run sends
+If-None-Match / If-Modified-Since, so unchanged assets come back as 304s, and
+bodies whose hash did not change are not written again. The files that did
+change are listed under "changed" so later pipeline steps can reprocess only
+those.
+"""
+
+import json
+import os
+import threading
+
+MANIFEST_FILE = "crawl_manifest.json"
+
+class CrawlManifest:
+    def __init__(self, path: str = MANIFEST_FILE, conditional: bool = False):
+        self.path = path
+        self.conditional = conditional
+        self.entries = {}
+        self.changed = []  # (url, output path) written this run
+        self.not_modified = 0
+        self.lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f).get("urls", {})
+
+    def conditional_headers(self, url: str) -> dict:
+        """Validators to send for url, or {} when not recrawling."""
+        if not self.conditional:
+            return {}
+        with self.lock:
+            entry = self.entries.get(url)
+        if not entry or not self._outputs_exist(entry):
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def not_modified_entry(self, url: str) -> dict:
+        """Called on a 304: the cached entry stands in for the response."""
+        with self.lock:
+            self.not_modified += 1
+            return self.entries.get(url, {})
+
+    def unchanged_entry(self, url: str, sha256: str):
+        """The cached entry if the body hash matches and its outputs are still on disk."""
+        with self.lock:
+            entry = self.entries.get(url)
+        if entry and entry.get("sha256") == sha256 and self._outputs_exist(entry):
+            return entry
+        return None
+
+    def record(self, url: str, headers, sha256: str, outputs, links, changed: bool = True):
+        entry = {
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "sha256": sha256,
+            "outputs": list(outputs),
+            "links": list(links),
+        }
+        with self.lock:
+            self.entries[url] = entry
+            if changed:
+                self.changed.extend((url, out) for out in outputs)
+
+    def save(self):
+        with self.lock:
+            data = {
+                "urls": self.entries,
+                "changed": [out for _, out in self.changed],
+            }
+        tmp = self.path + ".tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self.path)
+
+    def print_report(self):
+        print(f"Not modified (304): {self.not_modified}")
+        print(f"Changed or new assets: {len(self.changed)}")
+        for url, out in self.changed:
+            print(f"  {out} <- {url}")
+
+    @staticmethod
+    def _outputs_exist(entry) -> bool:
+        return all(os.path.exists(p) for p in entry.get("outputs", []))
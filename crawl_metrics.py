@@ -0,0 +1,79 @@
+"""
+Per-request metrics for scra.py.
+
+Every request becomes one JSON line in crawl_metrics.jsonl:
+
+    {"url": ..., "status": 200, "kind": "embedded", "bytes": 2483311,
+     "ttfb_s": 0.112, "total_s": 1.904, "decode_s": 0.041, "parse_s": 0.0}
+
+kind is pdf / embedded / html / other (not text, not parsed) / not_modified /
+unchanged / skipped / error.
+ttfb_s runs until the response headers arrive, so it includes DNS and connect
+time. decode_s is time spent decoding embedded base64 and parse_s time spent
+pulling links out of HTML. At the end of the crawl print_summary() shows
+latency percentiles, throughput and the slowest URLs.
+"""
+
+import json
+import threading
+from collections import Counter
+
+METRICS_FILE = "crawl_metrics.jsonl"
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers (0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+class CrawlMetrics:
+    def __init__(self, path: str = METRICS_FILE):
+        self.path = path
+        self.file = open(path, 'w', encoding='utf-8')
+        self.lock = threading.Lock()
+        # (total_s, ttfb_s, bytes, url) per request; the full records are only on disk
+        self.samples = []
+        self.kinds = Counter()
+        self.statuses = Counter()
+        self.decode_s = 0.0
+        self.parse_s = 0.0
+
+    def record(self, rec: dict):
+        line = json.dumps(rec, ensure_ascii=False)
+        with self.lock:
+            self.file.write(line + "\n")
+            self.samples.append((rec.get("total_s", 0.0), rec.get("ttfb_s"), rec.get("bytes", 0), rec["url"]))
+            self.kinds[rec.get("kind", "?")] += 1
+            if rec.get("status") is not None:
+                self.statuses[rec["status"]] += 1
+            self.decode_s += rec.get("decode_s", 0.0)
+            self.parse_s += rec.get("parse_s", 0.0)
+
+    def close(self):
+        with self.lock:
+            self.file.close()
+
+    def print_summary(self, elapsed: float, slowest: int = 5):
+        with self.lock:
+            samples = list(self.samples)
+        if not samples:
+            print("No requests recorded.")
+            return
+        totals = [s[0] for s in samples]
+        ttfbs = [s[1] for s in samples if s[1] is not None]
+        total_bytes = sum(s[2] for s in samples)
+        elapsed = max(elapsed, 1e-9)
+        print(f"\n=== CRAWL METRICS ({self.path}) ===")
+        print(f"Requests: {len(samples)} in {elapsed:.1f}s ({len(samples) / elapsed:.2f} pages/s)")
+        print(f"Transferred: {total_bytes / (1024 * 1024):.1f} MB ({total_bytes / (1024 * 1024) / elapsed:.2f} MB/s)")
+        print(f"Latency p50/p95: {percentile(totals, 50):.3f}s / {percentile(totals, 95):.3f}s")
+        print(f"TTFB p50/p95: {percentile(ttfbs, 50):.3f}s / {percentile(ttfbs, 95):.3f}s")
+        print(f"Base64 decode: {self.decode_s:.2f}s, link parsing: {self.parse_s:.2f}s")
+        print("By kind: " + ", ".join(f"{k}={n}" for k, n in self.kinds.most_common()))
+        print("By status: " + ", ".join(f"{k}={n}" for k, n in sorted(self.statuses.items())))
+        print(f"Slowest {min(slowest, len(samples))}:")
+        for total_s, ttfb_s, nbytes, url in sorted(samples, key=lambda s: s[0], reverse=True)[:slowest]:
+            ttfb = f"{ttfb_s:.3f}s" if ttfb_s is not None else "-"
+            print(f"  {total_s:7.3f}s  ttfb {ttfb}  {nbytes / 1024:9.1f} KB  {url}")
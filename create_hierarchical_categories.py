@@ -1,54 +1,27 @@
 import json
-import os
 from collections import OrderedDict
 
-def get_chapter_hierarchy():
+from corpus import Corpus, page_number, page_numbers
+
+def get_chapter_hierarchy(chapters):
     """
-    Extract the hierarchical structure from ordered_unit_files.
+    The hierarchical structure of chapters (from ordered_unit_files, see Corpus.chapters_from_unit_pages()).
     Returns a dictionary with chapter info and their units.
     """
     hierarchy = OrderedDict()
-    unit_files = sorted([f for f in os.listdir('ordered_unit_files') if f.endswith('.txt')])
-    
-    for fname in unit_files:
-        with open(os.path.join('ordered_unit_files', fname), 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-            
-        chapter_line = None
-        units = []
-        
-        for line in lines:
-            line = line.strip()
-            if line.startswith('Glava '):
-                chapter_line = line
-            elif line.startswith('❖ '):
-                unit_name = line[2:].strip()
-                if unit_name:
-                    units.append(unit_name)
-        
-        if chapter_line and units:
-            hierarchy[chapter_line] = units
+    for chapter in chapters:
+        if chapter.title and chapter.units:
+            hierarchy[chapter.title] = list(chapter.units)
     
     return hierarchy
 
-def find_missing_pages():
-    """Find pages that exist in data but aren't categorized."""
-    # Get all existing pages
-    data_files = set()
-    for f in os.listdir('data'):
-        if f.startswith('page_') and f.endswith('_extracted_text.txt'):
-            page_num = int(f.split('_')[1])
-            data_files.add(page_num)
-    
-    # Get all categorized pages
-    with open('humancategories.json', 'r', encoding='utf-8') as f:
-        categories = json.load(f)
-    
+def find_missing_pages(categories, data_files):
+    """Find pages that exist in data (the page numbers data_files) but aren't categorized."""
     categorized_files = set()
     for unit_files in categories.values():
         for filename in unit_files:
-            if filename.startswith('page_') and filename.endswith('_extracted_text.txt'):
-                page_num = int(filename.split('_')[1])
+            page_num = page_number(filename)
+            if page_num is not None:
                 categorized_files.add(page_num)
     
     # Find missing pages
@@ -59,15 +32,11 @@ def find_missing_pages():
     
     return missing_pages
 
-def create_hierarchical_json():
+def create_hierarchical_json(flat_categories, chapters, data_files):
     """Create a new JSON with hierarchical structure and missing pages."""
     
-    # Load existing categories
-    with open('humancategories.json', 'r', encoding='utf-8') as f:
-        flat_categories = json.load(f, object_pairs_hook=OrderedDict)
-    
     # Get chapter hierarchy
-    chapter_hierarchy = get_chapter_hierarchy()
+    chapter_hierarchy = get_chapter_hierarchy(chapters)
     print("Chapter hierarchy:")
     for chapter, units in chapter_hierarchy.items():
         print(f"  {chapter}")
@@ -76,7 +45,7 @@ def create_hierarchical_json():
         print()
     
     # Find missing pages
-    missing_pages = find_missing_pages()
+    missing_pages = find_missing_pages(flat_categories, data_files)
     print(f"Missing pages to be added as 'Uncategorized': {missing_pages}")
     
     # Create hierarchical structure
@@ -86,8 +55,8 @@ def create_hierarchical_json():
     all_pages = set()
     for unit_files in flat_categories.values():
         for filename in unit_files:
-            if filename.startswith('page_'):
-                page_num = int(filename.split('_')[1])
+            page_num = page_number(filename)
+            if page_num is not None:
                 all_pages.add(page_num)
     
     # Add missing pages to the list
@@ -105,8 +74,8 @@ def create_hierarchical_json():
         for unit_name in chapter_units:
             if unit_name in flat_categories:
                 for filename in flat_categories[unit_name]:
-                    if filename.startswith('page_'):
-                        page_num = int(filename.split('_')[1])
+                    page_num = page_number(filename)
+                    if page_num is not None:
                         chapter_pages.append(page_num)
         
         if chapter_pages:
@@ -151,7 +120,11 @@ def create_hierarchical_json():
     return hierarchical_json
 
 def main():
-    hierarchical_data = create_hierarchical_json()
+    # Load existing categories
+    with open('humancategories.json', 'r', encoding='utf-8') as f:
+        flat_categories = json.load(f, object_pairs_hook=OrderedDict)
+    chapters = Corpus.load('ordered_unit_files').chapters_from_unit_pages()
+    hierarchical_data = create_hierarchical_json(flat_categories, chapters, page_numbers('data'))
     
     # Save to new file
     output_file = 'hierarchical_categories.json'
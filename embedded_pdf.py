@@ -0,0 +1,119 @@
+"""
+Single-pass scanner for base64 PDFs embedded in course-site assets.
+
+The slide viewer ships each deck as a JS file along the lines of
+local_pdf({"pdf": "JVBERi0xLjQK..."}), often several MB long. The scanner
+is fed the asset chunk by chunk, looks for the base64 form of "%PDF", and
+decodes the run that follows straight into the PDF store, a few KB at a
+time. The header is checked as soon as the first bytes are decoded, so a
+false start is dropped without decoding the rest of the run. Like the
+regex it replaced (JVBERi0[^"]{20,}), a run shorter than MIN_RUN characters
+is not a PDF: a script comparing against "JVBERi0" is skipped and the scan
+goes on to the next marker.
+"""
+
+import binascii
+import re
+
+# base64 of "%PDF" is "JVBERg==", so every PDF run starts with "JVBER"
+MARKER = b"JVBER"
+RUN_RE = re.compile(rb"[A-Za-z0-9+/]*")
+DECODE_SIZE = 64 * 1024  # base64 characters decoded per write
+MIN_RUN = len("JVBERi0") + 20  # base64 characters in the shortest run kept
+
+class EmbeddedPdfScanner:
+    """
+    Feed it the bytes of a text asset with feed(), then call close().
+
+    The first embedded PDF found is written to `store` under `url`; its path
+    ends up in `result` (None if the asset had none).
+    """
+
+    def __init__(self, store, url):
+        self.store = store
+        self.url = url
+        self.result = None
+        self.tail = b""  # end of the previous chunk, in case MARKER straddles two
+        self.pending = None  # PendingPdf being written
+        self.b64 = bytearray()  # run characters not decoded yet
+        self.decoded = 0
+        self.run_length = 0  # base64 characters in the current run
+        self.skipping = False  # inside a run whose header was not %PDF
+
+    def feed(self, data: bytes):
+        while data and self.result is None:
+            if self.pending is None and not self.skipping:
+                data = self.tail + data
+                idx = data.find(MARKER)
+                if idx < 0:
+                    self.tail = data[-(len(MARKER) - 1):]
+                    return
+                self.tail = b""
+                data = data[idx:]
+                self.pending = self.store.open_pdf()
+            run = RUN_RE.match(data)
+            data = data[run.end():]
+            if self.skipping:
+                if data:
+                    self.skipping = False
+                continue
+            self.b64 += run.group()
+            self.run_length += run.end()
+            # decode the first 8 characters right away so the header check happens early
+            if data or len(self.b64) >= DECODE_SIZE or (self.decoded == 0 and len(self.b64) >= 8):
+                self._decode(final=bool(data))
+            if data and self.pending is not None:
+                self._finish()
+
+    def close(self):
+        """Finish a run that lasted to the end of the asset. Returns `result`."""
+        if self.pending is not None:
+            self._decode(final=True)
+            if self.pending is not None:
+                self._finish()
+        return self.result
+
+    def _decode(self, final: bool):
+        if self.pending is None:
+            return
+        if final:
+            # pad like base64.b64decode(s + "===") did; a lone trailing char carries no byte
+            extra = len(self.b64) % 4
+            if extra == 1:
+                del self.b64[-1]
+            elif extra:
+                self.b64 += b"=" * (4 - extra)
+            cut = len(self.b64)
+        else:
+            cut = len(self.b64) - len(self.b64) % 4
+        if not cut:
+            return
+        raw = binascii.a2b_base64(bytes(self.b64[:cut]))
+        del self.b64[:cut]
+        if self.decoded < 4:
+            head = raw[:4 - self.decoded]
+            if not b"%PDF"[self.decoded:self.decoded + len(head)] == head:
+                self._reject(final)
+                return
+        self.pending.write(raw)
+        self.decoded += len(raw)
+
+    def _reject(self, final: bool):
+        self.pending.discard()
+        self.pending = None
+        self.b64.clear()
+        self.decoded = 0
+        self.run_length = 0
+        # skip the rest of this run before searching for the next marker
+        self.skipping = not final
+
+    def _finish(self):
+        if self.decoded < 4 or self.run_length < MIN_RUN:
+            self.pending.discard()
+        else:
+            self.result, _ = self.pending.commit(self.url)
+            print("Saved embedded pdf:", self.result)
+        self.pending = None
+        self.b64.clear()
+        self.decoded = 0
+        self.run_length = 0
@@ -0,0 +1,68 @@
+"""
+Text extraction backends for extract_pdf_text.py.
+
+A backend opens one PDF at a time and returns the text of a page:
+
+    backend = make_backend("pypdf")
+    page_count = backend.open("deck.pdf")
+    text = backend.page_text(0)
+
+    pypdf         pypdf's default extract_text() (what the pipeline has always used)
+    pypdf-layout  pypdf's layout mode, which keeps the horizontal positions of the text
+    PyPDF2        PyPDF2 3.x, already in requirements.txt
+
+backend.key names the backend and library version; extract_cache.py keys
+cached text by it. benchmarks/bench_extractors.py compares the backends
+for speed, memory and agreement with the data/ texts.
+"""
+
+try:
+    import pypdf
+except ImportError:  # extract_pdf_text.py reports it
+    pypdf = None
+
+try:
+    import PyPDF2
+except ImportError:
+    PyPDF2 = None
+
+DEFAULT_BACKEND = "pypdf"
+
+class PypdfBackend:
+    name = "pypdf"
+    library = pypdf
+    library_name = "pypdf"
+    extract_kwargs = {}
+
+    def __init__(self):
+        if self.library is None:
+            raise RuntimeError(f"backend {self.name} needs the {self.library_name} library")
+        self.key = f"{self.name}/{self.library.__version__}"
+        self.reader = None
+
+    def open(self, path: str) -> int:
+        self.reader = self.library.PdfReader(path)
+        return len(self.reader.pages)
+
+    def page_text(self, index: int) -> str:
+        return self.reader.pages[index].extract_text(**self.extract_kwargs)
+
+class PypdfLayoutBackend(PypdfBackend):
+    name = "pypdf-layout"
+    extract_kwargs = {"extraction_mode": "layout"}
+
+class PyPDF2Backend(PypdfBackend):
+    name = "PyPDF2"
+    library = PyPDF2
+    library_name = "PyPDF2"
+
+BACKENDS = {cls.name: cls for cls in (PypdfBackend, PypdfLayoutBackend, PyPDF2Backend)}
+
+def available_backends() -> list:
+    return [name for name, cls in BACKENDS.items() if cls.library is not None]
+
+def make_backend(name: str = DEFAULT_BACKEND):
+    """A fresh backend by name; raises ValueError for an unknown name and RuntimeError if its library is missing."""
+    if name not in BACKENDS:
+        raise ValueError(f"unknown extraction backend {name!r} (choose from {', '.join(BACKENDS)})")
+    return BACKENDS[name]()
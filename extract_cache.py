@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Persistent cache of extracted page text for extract_pdf_text.py.
+
+Re-crawls mostly bring back PDFs that did not change, and trying different
+downstream settings means extracting the same decks again. The cache keeps
+the raw text of every page, keyed by
+
+    (sha256 of the PDF, page number, extractor backend and version)
+
+so a PDF is recognised by its content, wherever it lives and whatever it is
+called, and upgrading pypdf (or switching backend) never serves text from
+the old one. The page count is kept per PDF as well, so a PDF whose pages
+are all cached is not even opened. Timed-out pages are not cached; errors
+are, since the same extractor fails the same way again.
+
+Entries live in one SQLite file (safe to share between --jobs workers).
+Lookups only read; new pages and the last-used times of hits are buffered
+and written in one short transaction per PDF (or every FLUSH_BYTES of
+text), so one worker never holds the write lock while it extracts. evict()
+drops the least recently used pages until the cache fits in its size cap;
+extract_pdf_text.py does that at the end of every directory run.
+
+Usage:
+    python extract_cache.py                      # stats
+    python extract_cache.py evict --max-mb 100
+    python extract_cache.py clear
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import time
+
+CACHE_PATH = "extraction_cache.sqlite"
+CACHE_MB = 512
+FLUSH_BYTES = 4 * 1024 * 1024  # buffered page text is written out early past this
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    sha256 TEXT NOT NULL, backend TEXT NOT NULL, page INTEGER NOT NULL,
+    status TEXT NOT NULL, text TEXT NOT NULL, bytes INTEGER NOT NULL, used REAL NOT NULL,
+    PRIMARY KEY (sha256, backend, page));
+CREATE INDEX IF NOT EXISTS pages_used ON pages (used);
+CREATE TABLE IF NOT EXISTS pdfs (
+    sha256 TEXT NOT NULL, backend TEXT NOT NULL, page_count INTEGER NOT NULL,
+    PRIMARY KEY (sha256, backend));
+CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+"""
+
+class ExtractCache:
+    """
+    Page text cache for one extractor backend, e.g. "pypdf/6.2.0".
+
+    get() returns (status, text) or None; put() stores a page. Both only
+    touch memory; commit() writes the new pages, page counts and hit times
+    in one transaction, and adds this process's hits and misses to the
+    totals shown by stats().
+    """
+
+    def __init__(self, backend: str, path: str = CACHE_PATH, max_mb: float = CACHE_MB):
+        self.backend = backend
+        self.path = path
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        self._counted = (0, 0)
+        self._pages = {}  # (sha256, page) -> (status, text, bytes), not written yet
+        self._pending_bytes = 0
+        self._page_counts = {}  # sha256 -> page count, not written yet
+        self._used = {}  # (sha256, page) -> time of the last hit, not written yet
+        self.db = sqlite3.connect(path, timeout=60)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA)
+
+    def page_count(self, sha256: str):
+        if sha256 in self._page_counts:
+            return self._page_counts[sha256]
+        row = self.db.execute("SELECT page_count FROM pdfs WHERE sha256 = ? AND backend = ?",
+                              (sha256, self.backend)).fetchone()
+        return row[0] if row else None
+
+    def put_page_count(self, sha256: str, page_count: int):
+        self._page_counts[sha256] = page_count
+
+    def get(self, sha256: str, page: int):
+        pending = self._pages.get((sha256, page))
+        if pending is not None:
+            row = pending[:2]
+        else:
+            row = self.db.execute("SELECT status, text FROM pages WHERE sha256 = ? AND backend = ? AND page = ?",
+                                  (sha256, self.backend, page)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._used[(sha256, page)] = time.time()
+        return row
+
+    def put(self, sha256: str, page: int, status: str, text: str):
+        size = len(text.encode("utf-8"))
+        self._pages[(sha256, page)] = (status, text, size)
+        self._pending_bytes += size
+        if self._pending_bytes >= FLUSH_BYTES:
+            self.commit()
+
+    def commit(self):
+        """Write everything buffered since the last commit in one transaction."""
+        hits, misses = self.hits - self._counted[0], self.misses - self._counted[1]
+        if not (self._pages or self._page_counts or self._used or hits or misses):
+            return
+        now = time.time()
+        with self.db:
+            self.db.executemany("INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                [(sha256, self.backend, page, status, text, size, now)
+                                 for (sha256, page), (status, text, size) in self._pages.items()])
+            self.db.executemany("INSERT OR REPLACE INTO pdfs VALUES (?, ?, ?)",
+                                [(sha256, self.backend, count) for sha256, count in self._page_counts.items()])
+            self.db.executemany("UPDATE pages SET used = ? WHERE sha256 = ? AND backend = ? AND page = ?",
+                                [(used, sha256, self.backend, page) for (sha256, page), used in self._used.items()])
+            for name, value in (("hits", hits), ("misses", misses)):
+                if value:
+                    self.db.execute("INSERT INTO counters VALUES (?, ?) "
+                                    "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value", (name, value))
+        self._counted = (self.hits, self.misses)
+        self._pages.clear()
+        self._pending_bytes = 0
+        self._page_counts.clear()
+        self._used.clear()
+
+    def evict(self, max_bytes: int = None):
+        """Drop least recently used pages (of any backend) until the text fits in max_bytes. Returns (pages, bytes) dropped."""
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        self.commit()
+        total = self.db.execute("SELECT COALESCE(SUM(bytes), 0) FROM pages").fetchone()[0]
+        if total <= max_bytes:
+            return 0, 0
+        remaining = total
+        for used, size in self.db.execute("SELECT used, bytes FROM pages ORDER BY used").fetchall():
+            if remaining <= max_bytes:
+                break
+            cutoff = used
+            remaining -= size
+        dropped = self.db.execute("DELETE FROM pages WHERE used <= ?", (cutoff,)).rowcount
+        dropped_bytes = total - self.db.execute("SELECT COALESCE(SUM(bytes), 0) FROM pages").fetchone()[0]
+        # a page count alone would still skip opening the PDF, but with no pages left it is not worth keeping
+        self.db.execute("DELETE FROM pdfs WHERE NOT EXISTS (SELECT 1 FROM pages "
+                        "WHERE pages.sha256 = pdfs.sha256 AND pages.backend = pdfs.backend)")
+        self.db.commit()
+        self._shrink()
+        return dropped, dropped_bytes
+
+    def _shrink(self):
+        self.db.execute("VACUUM")
+        self.db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def clear(self):
+        self.db.executescript("DELETE FROM pages; DELETE FROM pdfs; DELETE FROM counters;")
+        self.db.commit()
+        self._shrink()
+
+    def stats(self) -> dict:
+        self.commit()
+        counters = dict(self.db.execute("SELECT name, value FROM counters"))
+        backends = self.db.execute(
+            "SELECT backend, COUNT(DISTINCT sha256), COUNT(*), SUM(bytes) FROM pages GROUP BY backend ORDER BY backend"
+        ).fetchall()
+        oldest, newest = self.db.execute("SELECT MIN(used), MAX(used) FROM pages").fetchone()
+        return {
+            "path": self.path,
+            "file_bytes": sum(os.path.getsize(p) for p in (self.path, self.path + "-wal") if os.path.exists(p)),
+            "max_bytes": self.max_bytes,
+            "hits": counters.get("hits", 0),
+            "misses": counters.get("misses", 0),
+            "backends": [{"backend": b, "pdfs": pdfs, "pages": pages, "bytes": size or 0} for b, pdfs, pages, size in backends],
+            "oldest_use": oldest,
+            "newest_use": newest,
+        }
+
+    def close(self):
+        self.commit()
+        self.db.close()
+
+def print_stats(stats: dict) -> None:
+    mb = 1024 * 1024
+    text_bytes = sum(b["bytes"] for b in stats["backends"])
+    print(f"Extraction cache: {stats['path']} ({stats['file_bytes'] / mb:.1f} MB on disk)")
+    print(f"  Text: {text_bytes / mb:.1f} MB of {stats['max_bytes'] / mb:g} MB cap")
+    for b in stats["backends"]:
+        print(f"  {b['backend']}: {b['pdfs']} PDFs, {b['pages']} pages, {b['bytes'] / mb:.1f} MB")
+    lookups = stats["hits"] + stats["misses"]
+    if lookups:
+        print(f"  Lookups: {lookups}, {stats['hits']} hits ({100 * stats['hits'] / lookups:.0f}%)")
+    if stats["oldest_use"]:
+        fmt = "%Y-%m-%d %H:%M"
+        print(f"  Last used: {time.strftime(fmt, time.localtime(stats['oldest_use']))} (oldest entry) to "
+              f"{time.strftime(fmt, time.localtime(stats['newest_use']))}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or trim the extract_pdf_text.py page cache.")
+    parser.add_argument("command", nargs="?", choices=["stats", "evict", "clear"], default="stats",
+                        help="stats: sizes and hit rate; evict: drop least recently used pages down to --max-mb; "
+                             "clear: empty the cache (default: %(default)s)")
+    parser.add_argument("--cache", default=CACHE_PATH, help="Cache file (default: %(default)s)")
+    parser.add_argument("--max-mb", type=float, default=CACHE_MB, help="Size cap for evict (default: %(default)s)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.cache):
+        print(f"No cache at {args.cache}")
+        sys.exit(0 if args.command == "stats" else 1)
+    cache = ExtractCache("", args.cache, args.max_mb)
+    if args.command == "evict":
+        pages, size = cache.evict()
+        print(f"Evicted {pages} pages ({size / 1024 / 1024:.1f} MB)")
+    elif args.command == "clear":
+        cache.clear()
+        print(f"Cleared {args.cache}")
+    print_stats(cache.stats())
+    cache.close()
+
+if __name__ == "__main__":
+    main()
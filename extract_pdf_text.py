@@ -17,55 +17,176 @@ Examples:
 import os
 import sys
 import argparse
+import json
+import time
 from pathlib import Path
-from typing import Optional, List
+from typing import Iterator, Optional, List
 import traceback
+from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 try:
-    from pypdf import PdfReader
+    import pypdf
 except ImportError:
     print("Error: pypdf library not found. Install it with: pip install pypdf")
     sys.exit(1)
 
-def extract_text_from_pdf(pdf_path: str) -> str:
+from tqdm import tqdm
+
+from build_manifest import BuildManifest, BUILD_MANIFEST, file_sha256
+from extract_backends import BACKENDS, DEFAULT_BACKEND, available_backends, make_backend
+from extract_cache import ExtractCache, CACHE_PATH, CACHE_MB
+from page_select import parse_page_spec, select_pages
+from page_supervisor import SupervisedExtractor, PAGE_TIMEOUT, PAGE_MEMORY_MB, TIMED_OUT
+
+# bump when a change to extraction should invalidate text files already written
+TOOL = f"extract_pdf_text/1 pypdf/{pypdf.__version__}"
+TIMING_REPORT = "extraction_timings.jsonl"
+
+@dataclass(frozen=True)
+class ExtractOptions:
+    """How each PDF is extracted; passed as one picklable value to the worker processes."""
+    page_timeout: float = PAGE_TIMEOUT  # 0: extract inline, unsupervised
+    page_memory_mb: int = PAGE_MEMORY_MB
+    pages: Optional[str] = None  # page selection, e.g. "1" or "-1"; None for all pages
+    bare: bool = False  # no --- PAGE n --- header lines
+    cache: Optional[str] = CACHE_PATH  # page text cache file; None disables it
+    cache_mb: float = CACHE_MB
+    backend: str = DEFAULT_BACKEND  # see extract_backends.py
+
+def iter_page_blocks(pdf_path: str, extractor: Optional[SupervisedExtractor] = None,
+                     timings: Optional[list] = None, pages: Optional[str] = None, bare: bool = False,
+                     cache: Optional[ExtractCache] = None, backend: str = DEFAULT_BACKEND,
+                     progress: bool = False) -> Iterator[str]:
+    """
+    Yield the text of a PDF one page block at a time, as soon as each page is extracted.
+
+    Joining the blocks gives extract_text_from_pdf()'s text, but only the
+    current page is held in memory. Takes the same arguments, plus progress
+    for a per-page progress bar (shown on a terminal only). Errors reading
+    the PDF are raised rather than turned into text.
+    """
+    inline = None
+    opened = False
+
+    def open_pdf() -> int:
+        nonlocal inline, opened
+        opened = True
+        if extractor is None:
+            inline = make_backend(backend)
+            return inline.open(pdf_path)
+        return extractor.open(pdf_path)
+
+    bar = None
+    try:
+        sha = file_sha256(pdf_path) if cache is not None else None
+        page_count = cache.page_count(sha) if sha else None
+        if page_count is None:
+            page_count = open_pdf()
+            if sha:
+                cache.put_page_count(sha, page_count)
+        
+        print(f"Processing {os.path.basename(pdf_path)} ({page_count} pages)...")
+        
+        selected = select_pages(pages, page_count) if pages else range(1, page_count + 1)
+        bar = tqdm(total=len(selected), desc=os.path.basename(pdf_path), unit="page", leave=False,
+                   disable=None if progress else True)
+        for page_num in selected:
+            cached = cache.get(sha, page_num) if sha else None
+            if cached:
+                status, page_text = cached
+                seconds = 0.0
+            else:
+                if not opened:
+                    open_pdf()
+                if extractor is None:
+                    started = time.perf_counter()
+                    try:
+                        status, page_text = "ok", inline.page_text(page_num - 1)
+                    except Exception as e:
+                        status, page_text = "error", str(e)
+                    seconds = time.perf_counter() - started
+                else:
+                    status, page_text, seconds = extractor.page(page_num - 1)
+                if sha and status != "timeout":  # a bigger limit may still get a timed-out page
+                    cache.put(sha, page_num, status, page_text)
+            if timings is not None:
+                timings.append((pdf_path, page_num, seconds, "cached" if cached else status))
+                
+            if status == "timeout":
+                body = TIMED_OUT
+            elif status == "error":
+                body = f"[Error extracting text: {page_text}]"
+            elif page_text.strip():  # Only add non-empty pages
+                body = page_text
+            else:
+                body = "[No extractable text found]"
+            block = f"{body}\n" if bare else f"--- PAGE {page_num} ---\n{body}\n"
+            # a blank line separates a page from the next one in the document, so a
+            # selection is an exact slice of the full text (what page_select.py cuts)
+            if page_num < page_count:
+                block += "\n"
+            bar.update(1)
+            yield block
+    finally:
+        if bar is not None:
+            bar.close()
+        if cache is not None:
+            cache.commit()
+
+def extract_text_from_pdf(pdf_path: str, extractor: Optional[SupervisedExtractor] = None,
+                          timings: Optional[list] = None, pages: Optional[str] = None, bare: bool = False,
+                          cache: Optional[ExtractCache] = None, backend: str = DEFAULT_BACKEND) -> str:
     """
     Extract all text from a PDF file.
     
     Args:
         pdf_path: Path to the PDF file
+        extractor: Run each page in this supervised child process, so a page
+            that hangs or balloons memory becomes [Extraction timed out]
+            (default: extract inline)
+        timings: If given, (pdf_path, page, seconds, status) is appended for every page
+        pages: Only extract these pages, e.g. "1" or "-1" (see page_select.py)
+        bare: Leave out the --- PAGE n --- header lines
+        cache: Reuse page text extracted earlier from a PDF with the same
+            content (see extract_cache.py); the result is the same either way
+        backend: Extraction backend for inline extraction (see extract_backends.py);
+            a supervised extractor brings its own
         
     Returns:
         Extracted text as a string
     """
     try:
-        reader = PdfReader(pdf_path)
-        text_content = []
-        
-        print(f"Processing {os.path.basename(pdf_path)} ({len(reader.pages)} pages)...")
-        
-        for page_num, page in enumerate(reader.pages, 1):
-            try:
-                page_text = page.extract_text()
-                if page_text.strip():  # Only add non-empty pages
-                    text_content.append(f"--- PAGE {page_num} ---\n{page_text}\n")
-                else:
-                    text_content.append(f"--- PAGE {page_num} ---\n[No extractable text found]\n")
-            except Exception as e:
-                text_content.append(f"--- PAGE {page_num} ---\n[Error extracting text: {str(e)}]\n")
-                
-        return "\n".join(text_content)
-        
+        return "".join(iter_page_blocks(pdf_path, extractor, timings, pages, bare, cache, backend))
     except Exception as e:
         return f"Error reading PDF {pdf_path}: {str(e)}"
 
-def save_text_to_file(text: str, output_path: str) -> None:
-    """Save extracted text to a file."""
-    try:
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(text)
-        print(f"Text saved to: {output_path}")
-    except Exception as e:
-        print(f"Error saving text to {output_path}: {str(e)}")
+def extract_pdf_to_file(pdf_path: str, output_path: str, **kwargs) -> str:
+    """
+    Write the text of pdf_path to output_path page by page, as it is extracted.
+
+    Takes iter_page_blocks()'s keyword arguments. The text goes to a
+    temporary file that replaces output_path at the end, so output_path never
+    holds half a document; if the PDF cannot be read, it gets the same
+    "Error reading PDF" text extract_text_from_pdf() returns. Returns the
+    first 200 characters written.
+    """
+    tmp = output_path + ".part"
+    preview = ""
+    with open(tmp, 'w', encoding='utf-8') as f:
+        try:
+            for block in iter_page_blocks(pdf_path, **kwargs):
+                f.write(block)
+                if len(preview) < 200:
+                    preview += block[:200 - len(preview)]
+        except Exception as e:
+            preview = f"Error reading PDF {pdf_path}: {str(e)}"
+            f.seek(0)
+            f.truncate()
+            f.write(preview)
+    os.replace(tmp, output_path)
+    print(f"Text saved to: {output_path}")
+    return preview[:200]
 
 def get_pdf_files(directory: str) -> List[str]:
     """Get all PDF files in a directory."""
@@ -75,29 +196,123 @@ def get_pdf_files(directory: str) -> List[str]:
             pdf_files.append(os.path.join(directory, filename))
     return sorted(pdf_files)
 
-def process_single_pdf(pdf_path: str, output_dir: Optional[str] = None) -> None:
+def process_single_pdf(pdf_path: str, output_dir: Optional[str] = None, options: ExtractOptions = ExtractOptions()) -> None:
     """Process a single PDF file."""
     if not os.path.exists(pdf_path):
         print(f"Error: PDF file '{pdf_path}' not found.")
         return
         
     print(f"Extracting text from: {pdf_path}")
-    text = extract_text_from_pdf(pdf_path)
-    
     if output_dir:
         os.makedirs(output_dir, exist_ok=True)
-        base_name = os.path.splitext(os.path.basename(pdf_path))[0]
-        output_path = os.path.join(output_dir, f"{base_name}_extracted_text.txt")
-        save_text_to_file(text, output_path)
+        extract_pdf_to_file(pdf_path, output_path_for(pdf_path, output_dir), progress=True, **_extract_kwargs(options))
     else:
+        text = extract_text_from_pdf(pdf_path, **_extract_kwargs(options))
         print("\n" + "="*80)
         print(f"EXTRACTED TEXT FROM: {os.path.basename(pdf_path)}")
         print("="*80)
         print(text)
         print("="*80 + "\n")
 
-def process_directory(input_dir: str, output_dir: Optional[str] = None) -> None:
-    """Process all PDF files in a directory."""
+def output_path_for(pdf_path: str, output_dir: str) -> str:
+    base_name = os.path.splitext(os.path.basename(pdf_path))[0]
+    return os.path.join(output_dir, f"{base_name}_extracted_text.txt")
+
+_extractor = None
+
+def get_extractor(options: ExtractOptions) -> Optional[SupervisedExtractor]:
+    """This process's supervised extractor (None with page_timeout 0, i.e. extract inline)."""
+    global _extractor
+    if not options.page_timeout:
+        return None
+    settings = (options.page_timeout, options.page_memory_mb, options.backend)
+    if _extractor is None or (_extractor.timeout, _extractor.memory_mb, _extractor.backend) != settings:
+        if _extractor is not None:
+            _extractor.close()
+        _extractor = SupervisedExtractor(*settings)
+    return _extractor
+
+_cache = None
+
+def get_cache(options: ExtractOptions) -> Optional[ExtractCache]:
+    """This process's connection to the page text cache (None if disabled)."""
+    global _cache
+    if not options.cache:
+        return None
+    key = make_backend(options.backend).key
+    if _cache is None or (_cache.path, _cache.backend) != (options.cache, key):
+        _cache = ExtractCache(key, options.cache, options.cache_mb)
+    return _cache
+
+def _extract_kwargs(options: ExtractOptions) -> dict:
+    return {"extractor": get_extractor(options), "pages": options.pages, "bare": options.bare,
+            "cache": get_cache(options), "backend": options.backend}
+
+def process_pdf(pdf_path: str, output_dir: Optional[str] = None, options: ExtractOptions = ExtractOptions(),
+                progress: bool = False):
+    """
+    Extract one PDF and, with output_dir, stream its text into its text file.
+
+    Runs in the worker processes of process_directory(jobs > 1), so the
+    text is written where it was extracted and only a short result goes
+    back: (pdf_path, output path or None, text or its preview, error, page timings).
+    """
+    timings = []
+    try:
+        if not output_dir:
+            text = extract_text_from_pdf(pdf_path, timings=timings, **_extract_kwargs(options))
+            return pdf_path, None, text, None, timings
+        output_path = output_path_for(pdf_path, output_dir)
+        preview = extract_pdf_to_file(pdf_path, output_path, timings=timings, progress=progress,
+                                      **_extract_kwargs(options))
+        # the reader error is in the file already; the prefix is enough to tell the parent
+        return pdf_path, output_path, preview, None, timings
+    except Exception as e:
+        return pdf_path, None, "", str(e), timings
+
+def write_timing_report(timings: list, report_path: str, slowest: int = 5) -> None:
+    """Write one JSON line per page to report_path and print the slowest pages."""
+    with open(report_path, 'w', encoding='utf-8') as f:
+        for pdf_path, page, seconds, status in timings:
+            f.write(json.dumps({"pdf": pdf_path, "page": page, "seconds": round(seconds, 4), "status": status}) + "\n")
+    timed_out = sum(1 for t in timings if t[3] == "timeout")
+    total = sum(t[2] for t in timings)
+    print(f"\nPage timings: {len(timings)} pages, {total:.1f}s of extraction, {timed_out} timed out ({report_path})")
+    for pdf_path, page, seconds, status in sorted(timings, key=lambda t: t[2], reverse=True)[:slowest]:
+        print(f"  {seconds:8.3f}s  {os.path.basename(pdf_path)} page {page}" + (f"  [{status}]" if status != "ok" else ""))
+
+def _tally(pdf_path, output_path, text, error, manifest, successful, failed):
+    """Report one process_pdf() result and update the manifest. Returns the new (successful, failed)."""
+    if error:
+        print(f"Error processing {pdf_path}: {error}")
+        return successful, failed + 1
+    if output_path:
+        if text.startswith("Error reading PDF"):
+            manifest.forget(pdf_path)
+        else:
+            replaced = manifest.record(pdf_path, output_path)
+            if replaced:
+                print(f"Removed {replaced} (replaced by {output_path})")
+    else:
+        print(f"\n{'='*80}")
+        print(f"EXTRACTED TEXT FROM: {os.path.basename(pdf_path)}")
+        print('='*80)
+        print(text[:1000] + "..." if len(text) > 1000 else text)  # Show first 1000 chars
+        print('='*80)
+    return successful + 1, failed
+
+def process_directory(input_dir: str, output_dir: Optional[str] = None, force: bool = False, jobs: int = 1,
+                      options: ExtractOptions = ExtractOptions(), timing_report: Optional[str] = TIMING_REPORT) -> None:
+    """
+    Process all PDF files in a directory.
+
+    When writing to output_dir, PDFs whose text file is up to date according
+    to build_manifest.json are skipped (unless force), and text files of
+    deleted PDFs are removed. With jobs > 1 the PDFs are spread over that
+    many worker processes, largest first. Every page is extracted under
+    the options' time and memory limits (see page_supervisor.py), and its
+    time goes to timing_report.
+    """
     if not os.path.exists(input_dir):
         print(f"Error: Directory '{input_dir}' not found.")
         return
@@ -110,38 +325,57 @@ def process_directory(input_dir: str, output_dir: Optional[str] = None) -> None:
         
     print(f"Found {len(pdf_files)} PDF files in {input_dir}")
     
+    manifest = None
+    skipped = 0
     if output_dir:
         os.makedirs(output_dir, exist_ok=True)
         print(f"Output directory: {output_dir}")
+        params = {"pages": options.pages, "bare": options.bare, "backend": make_backend(options.backend).key}
+        manifest = BuildManifest("extract_pdf_text", output_dir, TOOL, params)
+        if force:
+            manifest.mark_stale()
+        for removed in manifest.remove_orphans():
+            print(f"Removed {removed} (input is gone)")
+        stale = [p for p in pdf_files if not manifest.is_fresh(p, output_path_for(p, output_dir))]
+        skipped = len(pdf_files) - len(stale)
+        pdf_files = stale
     
     successful = 0
     failed = 0
+    timings = []
     
-    for pdf_path in pdf_files:
-        try:
-            text = extract_text_from_pdf(pdf_path)
-            
-            if output_dir:
-                base_name = os.path.splitext(os.path.basename(pdf_path))[0]
-                output_path = os.path.join(output_dir, f"{base_name}_extracted_text.txt")
-                save_text_to_file(text, output_path)
-            else:
-                print(f"\n{'='*80}")
-                print(f"EXTRACTED TEXT FROM: {os.path.basename(pdf_path)}")
-                print('='*80)
-                print(text[:1000] + "..." if len(text) > 1000 else text)  # Show first 1000 chars
-                print('='*80)
-                
-            successful += 1
-            
-        except Exception as e:
-            print(f"Error processing {pdf_path}: {str(e)}")
-            failed += 1
+    if jobs > 1 and len(pdf_files) > 1:
+        # biggest files first, so a large deck does not start last and hold up the end of the run
+        pdf_files.sort(key=os.path.getsize, reverse=True)
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(process_pdf, pdf_path, output_dir, options) for pdf_path in pdf_files]
+            results = (future.result() for future in as_completed(futures))
+            for pdf_path, output_path, text, error, pdf_timings in results:
+                successful, failed = _tally(pdf_path, output_path, text, error, manifest, successful, failed)
+                timings += pdf_timings
+    else:
+        for pdf_path in pdf_files:
+            pdf_path, output_path, text, error, pdf_timings = process_pdf(pdf_path, output_dir, options, progress=True)
+            successful, failed = _tally(pdf_path, output_path, text, error, manifest, successful, failed)
+            timings += pdf_timings
             
+    if manifest is not None:
+        manifest.save()
+    cache = get_cache(options)
+    if cache is not None:
+        hits = sum(1 for t in timings if t[3] == "cached")
+        pages, size = cache.evict()
+        print(f"\nExtraction cache: {hits} of {len(timings)} pages reused"
+              + (f", evicted {pages} least recently used pages ({size / 1024 / 1024:.1f} MB)" if pages else ""))
+    if timing_report and timings:
+        write_timing_report(timings, timing_report)
+
     print(f"\nProcessing complete:")
     print(f"  Successful: {successful}")
     print(f"  Failed: {failed}")
-    print(f"  Total: {len(pdf_files)}")
+    if skipped:
+        print(f"  Skipped (up to date): {skipped}")
+    print(f"  Total: {len(pdf_files) + skipped}")
 
 def main():
     parser = argparse.ArgumentParser(
@@ -162,11 +396,42 @@ Examples:
                        help='Output directory for extracted text files (default: print to console)')
     parser.add_argument('--encoding', default='utf-8',
                        help='Text encoding for output files (default: utf-8)')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                       help='Extract this many PDFs in parallel worker processes (default: 1)')
+    parser.add_argument('--pages', default=None,
+                       help='Only extract these pages: 1, -1 (last), 1,-1 or 2-4 (default: all)')
+    parser.add_argument('--bare', action='store_true',
+                       help='Leave out the --- PAGE n --- lines (with --pages 1 this replaces the one_page.sh pass)')
+    parser.add_argument('--backend', default=DEFAULT_BACKEND, choices=list(BACKENDS),
+                       help='Text extraction backend, see extract_backends.py (default: %(default)s)')
+    parser.add_argument('--page-timeout', type=float, default=PAGE_TIMEOUT,
+                       help=f'Seconds a page may take before it is recorded as {TIMED_OUT}; 0 extracts inline without supervision (default: {PAGE_TIMEOUT:g})')
+    parser.add_argument('--page-memory-mb', type=int, default=PAGE_MEMORY_MB,
+                       help=f'Memory a page may take, same treatment as the timeout (default: {PAGE_MEMORY_MB})')
+    parser.add_argument('--timing-report', default=TIMING_REPORT,
+                       help=f'Per-page timings, one JSON line per page (default: {TIMING_REPORT})')
+    parser.add_argument('--cache', default=CACHE_PATH,
+                       help='Page text cache, keyed by PDF content and extractor version (default: %(default)s)')
+    parser.add_argument('--cache-mb', type=float, default=CACHE_MB,
+                       help='Evict least recently used pages beyond this size (default: %(default)s)')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Neither read nor fill the page text cache')
+    parser.add_argument('--force', action='store_true',
+                       help=f'Re-extract every PDF, even if {BUILD_MANIFEST} says its text file is up to date')
     
     args = parser.parse_args()
     
     input_path = args.input_path
     output_dir = args.output_dir
+    if args.pages:
+        try:
+            parse_page_spec(args.pages)
+        except ValueError as e:
+            parser.error(str(e))
+    if args.backend not in available_backends():
+        parser.error(f"backend {args.backend} needs the {BACKENDS[args.backend].library_name} library")
+    options = ExtractOptions(args.page_timeout, args.page_memory_mb, args.pages, args.bare,
+                             None if args.no_cache else args.cache, args.cache_mb, args.backend)
     
     # If no arguments provided, show help
     if len(sys.argv) == 1:
@@ -187,10 +452,10 @@ Examples:
     
     if os.path.isfile(input_path):
         print("Processing single PDF file...")
-        process_single_pdf(input_path, output_dir)
+        process_single_pdf(input_path, output_dir, options)
     elif os.path.isdir(input_path):
         print("Processing directory of PDF files...")
-        process_directory(input_path, output_dir)
+        process_directory(input_path, output_dir, args.force, args.jobs, options, args.timing_report)
     else:
         print(f"Error: '{input_path}' is not a valid file or directory.")
         sys.exit(1)
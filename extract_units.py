@@ -1,22 +1,25 @@
-import os
 import re
 
+from corpus import Chapter, Corpus, Page, write_pages
+
 SRC_DIR = 'ordered_text_page1_only'
 DST_DIR = 'ordered_text_units'
 
-os.makedirs(DST_DIR, exist_ok=True)
+def extract_units(lines):
+    """
+    The chapter line and curriculum units of a table-of-contents page, one per line.
+
+    Returns None if the page has no 'Glava N' line.
+    """
+    lines = [line.rstrip() for line in lines]
 
-def extract_units_from_file(src_path, dst_path):
-    with open(src_path, 'r', encoding='utf-8') as f:
-        lines = [line.rstrip() for line in f]
-    
     units = []
     i = 0
     # Find the line with 'Glava'
     while i < len(lines) and not re.match(r'^Glava \d+', lines[i]):
         i += 1
     if i == len(lines):
-        return  # No 'Glava' found
+        return None  # No 'Glava' found
     units.append(lines[i])
     i += 1
     # Collect curriculum units
@@ -37,17 +40,25 @@ def extract_units_from_file(src_path, dst_path):
         i += 1
     if current_unit:
         units.append(' '.join(current_unit))
-    # Write to new file
-    with open(dst_path, 'w', encoding='utf-8') as f:
-        for unit in units:
-            f.write(unit.strip() + '\n')
+    return [unit.strip() for unit in units]
+
+def extract_chapters(corpus):
+    """
+    Run extract_units() on every page of corpus and set its chapters from the result.
+
+    Returns the unit pages (what DST_DIR gets: one per table-of-contents page).
+    """
+    unit_pages = []
+    for page in corpus:
+        units = extract_units(page.lines)
+        if units is not None:
+            unit_pages.append(Page(page.number, page.name, units))
+    corpus.set_chapters(Chapter.from_unit_lines(page.number, page.lines) for page in unit_pages)
+    return unit_pages
 
 def main():
-    for fname in os.listdir(SRC_DIR):
-        if fname.endswith('.txt'):
-            src_path = os.path.join(SRC_DIR, fname)
-            dst_path = os.path.join(DST_DIR, fname)
-            extract_units_from_file(src_path, dst_path)
+    corpus = Corpus.load(SRC_DIR)
+    write_pages(extract_chapters(corpus), DST_DIR)
 
 if __name__ == '__main__':
     main()
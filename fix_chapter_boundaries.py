@@ -1,47 +1,32 @@
 import json
-import os
 from collections import OrderedDict
 
-def get_chapter_boundaries():
+from corpus import Corpus, page_number, page_numbers
+
+def get_chapter_boundaries(chapters):
     """
-    Get the page numbers where each chapter starts by examining ordered_unit_files.
+    Get the page numbers where each chapter starts (chapters from ordered_unit_files).
     """
-    chapter_pages = []
-    unit_files = sorted([f for f in os.listdir('ordered_unit_files') if f.endswith('.txt')])
-    
-    for fname in unit_files:
-        page_num = int(fname.split('_')[1])
-        chapter_pages.append(page_num)
-    
-    return sorted(chapter_pages)
+    return sorted(chapter.page for chapter in chapters)
 
-def fix_chapter_boundaries():
+def fix_chapter_boundaries(data, chapters, all_existing_pages):
     """
-    Fix the hierarchical JSON to include all pages in chapter boundary gaps.
+    Fix the hierarchical JSON data (in place) to include all pages in chapter boundary gaps.
+
+    all_existing_pages are the page numbers of the files in data/.
     """
     
-    # Load the current hierarchical categories
-    with open('hierarchical_categories_grouped.json', 'r', encoding='utf-8') as f:
-        data = json.load(f, object_pairs_hook=OrderedDict)
-    
     # Get chapter boundary pages
-    chapter_pages = get_chapter_boundaries()
+    chapter_pages = get_chapter_boundaries(chapters)
     print("Chapter boundary pages:", chapter_pages)
     
-    # Get all pages that exist in data
-    all_existing_pages = set()
-    for f in os.listdir('data'):
-        if f.startswith('page_') and f.endswith('_extracted_text.txt'):
-            page_num = int(f.split('_')[1])
-            all_existing_pages.add(page_num)
-    
     # Get all pages that are currently categorized
     categorized_pages = set()
     for chapter_data in data.values():
         for unit_files in chapter_data.values():
             for filename in unit_files:
-                if filename.startswith('page_') and filename.endswith('_extracted_text.txt'):
-                    page_num = int(filename.split('_')[1])
+                page_num = page_number(filename)
+                if page_num is not None:
                     categorized_pages.add(page_num)
     
     print(f"Total existing pages: {len(all_existing_pages)}")
@@ -72,8 +57,8 @@ def fix_chapter_boundaries():
                     if not isinstance(unit_files, list):
                         continue
                     for filename in unit_files:
-                        if filename.startswith('page_') and filename.endswith('_extracted_text.txt'):
-                            page_num = int(filename.split('_')[1])
+                        page_num = page_number(filename)
+                        if page_num is not None:
                             chapter_categorized_pages.append(page_num)
                 
                 if chapter_categorized_pages:
@@ -103,8 +88,8 @@ def fix_chapter_boundaries():
                     if not isinstance(unit_files, list):
                         continue
                     for filename in unit_files:
-                        if filename.startswith('page_') and filename.endswith('_extracted_text.txt'):
-                            page_num = int(filename.split('_')[1])
+                        page_num = page_number(filename)
+                        if page_num is not None:
                             chapter_categorized_pages.append(page_num)
                 
                 if chapter_categorized_pages:
@@ -192,7 +177,11 @@ def fix_chapter_boundaries():
     return data
 
 def main():
-    fixed_data = fix_chapter_boundaries()
+    # Load the current hierarchical categories
+    with open('hierarchical_categories_grouped.json', 'r', encoding='utf-8') as f:
+        data = json.load(f, object_pairs_hook=OrderedDict)
+    chapters = Corpus.load('ordered_unit_files').chapters_from_unit_pages()
+    fixed_data = fix_chapter_boundaries(data, chapters, page_numbers('data'))
     
     # Save to new file
     output_file = 'hierarchical_categories_fixed.json'
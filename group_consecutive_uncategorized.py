@@ -1,14 +1,17 @@
 import json
 from collections import OrderedDict
 
-def group_consecutive_uncategorized():
+def group_consecutive_uncategorized(data=None):
     """
     Group consecutive uncategorized pages into single categories.
+
+    Works on data in place (default: hierarchical_categories.json).
     """
     
     # Load the hierarchical categories
-    with open('hierarchical_categories.json', 'r', encoding='utf-8') as f:
-        data = json.load(f, object_pairs_hook=OrderedDict)
+    if data is None:
+        with open('hierarchical_categories.json', 'r', encoding='utf-8') as f:
+            data = json.load(f, object_pairs_hook=OrderedDict)
     
     # Process each chapter
     for chapter_name, chapter_data in data.items():
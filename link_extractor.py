@@ -0,0 +1,74 @@
+"""
+Link extraction backends for scra.py.
+
+All the crawler needs from an HTML page is the href of every <a> tag, so
+building a full BeautifulSoup tree per page is wasted work. Backends:
+
+    stream - html.parser event handler; sees each tag once, keeps no tree (default)
+    regex  - one compiled pattern over the raw text; fastest, least forgiving
+    bs4    - BeautifulSoup with html.parser, the original behaviour
+
+The stream and regex backends fall back to bs4 when they choke on a page or
+find no links in a page that clearly has some.
+"""
+
+import html
+import re
+from html.parser import HTMLParser
+
+from bs4 import BeautifulSoup
+
+DEFAULT_BACKEND = "stream"
+
+HREF_RE = re.compile(
+    r"""<a\s[^>]*?\bhref\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>"']+))""",
+    re.IGNORECASE,
+)
+
+class _AnchorCollector(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.links = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag != "a":
+            return
+        for name, value in attrs:
+            if name == "href" and value is not None:
+                self.links.append(value)
+                return
+
+    handle_startendtag = handle_starttag
+
+def extract_links_bs4(text: str) -> list:
+    soup = BeautifulSoup(text, "html.parser")
+    return [a["href"] for a in soup.find_all("a", href=True)]
+
+def extract_links_stream(text: str) -> list:
+    parser = _AnchorCollector()
+    parser.feed(text)
+    parser.close()
+    return parser.links
+
+def extract_links_regex(text: str) -> list:
+    return [html.unescape(a or b or c) for a, b, c in HREF_RE.findall(text)]
+
+BACKENDS = {
+    "stream": extract_links_stream,
+    "regex": extract_links_regex,
+    "bs4": extract_links_bs4,
+}
+
+def extract_links(text: str, backend: str = DEFAULT_BACKEND) -> list:
+    """Return the raw href values of all <a> tags in text, in document order."""
+    extractor = BACKENDS[backend]
+    if extractor is extract_links_bs4:
+        return extractor(text)
+    try:
+        links = extractor(text)
+    except Exception:
+        return extract_links_bs4(text)
+    if not links and ("href" in text or "HREF" in text):
+        # malformed markup the fast path could not follow
+        return extract_links_bs4(text)
+    return links
@@ -29,13 +29,15 @@ def natural_sort_key(filename):
         return int(match.group(1))
     return 0
 
-def merge_pdfs(input_folder, output_filename):
+def merge_pdfs(input_folder, output_filename, compact=False):
     """
     Merge all PDF files from input_folder into a single PDF.
     
     Args:
         input_folder (str): Path to folder containing PDF files
         output_filename (str): Name of the output merged PDF file
+        compact (bool): Share identical fonts/images across the merged decks
+            and drop unused resources afterwards (see pdf_compact.py)
     """
     # Get all PDF files from the input folder
     pdf_pattern = os.path.join(input_folder, "page_*.pdf")
@@ -79,6 +81,12 @@ def merge_pdfs(input_folder, output_filename):
         file_size_mb = file_size / (1024 * 1024)
         print(f"Output file size: {file_size_mb:.2f} MB")
 
+        if compact:
+            from pdf_compact import compact_file
+            before, after = compact_file(output_filename, output_filename)
+            print(f"Compacted: {before / (1024 * 1024):.2f} MB -> {after / (1024 * 1024):.2f} MB "
+                  f"({100 * (before - after) / before:.0f}% smaller)")
+
     except Exception as e:
         print(f"Error writing merged PDF: {str(e)}")
 
@@ -89,6 +97,7 @@ if __name__ == "__main__":
     default_output = str((Path(__file__).parent / "merged_document.pdf").resolve())
     parser.add_argument("-i", "--input", dest="input_folder", default=default_input, help="Folder containing PDFs (default: %(default)s)")
     parser.add_argument("-o", "--output", dest="output_filename", default=default_output, help="Output merged PDF path (default: %(default)s)")
+    parser.add_argument("--compact", action="store_true", help="Deduplicate and recompress the merged PDF after writing it")
     args = parser.parse_args()
 
     input_folder = args.input_folder
@@ -99,7 +108,7 @@ if __name__ == "__main__":
     print(f"Output file: {output_filename}")
     print("-" * 50)
 
-    merge_pdfs(input_folder, output_filename)
+    merge_pdfs(input_folder, output_filename, args.compact)
 
     print("-" * 50)
     print("PDF merge process completed!")
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Packed single-file format for a directory of page_XXXX_extracted_text.txt files.
+
+The categorization scripts read data/ as 458 small files, one open() each.
+A pack holds the same page texts in one file:
+
+    b"PGPACK1\n"
+    page texts, UTF-8, back to back
+    index: one (page, offset, length, sha256) record per page, by page number
+    footer: index offset, page count, b"PGPACK1\n"
+
+PackedCorpus opens it once, maps it with mmap and reads the index with a
+single struct call. page_bytes(n) is a zero-copy memoryview into the map,
+text(n) decodes it, and iterating yields the pages in page order. export()
+writes the per-page directory back out, byte for byte, for the scripts that
+still want files.
+
+Usage:
+    python packed_corpus.py pack data/ data.pack
+    python packed_corpus.py export data.pack data_copy/
+    python packed_corpus.py verify data.pack
+"""
+
+import argparse
+import hashlib
+import mmap
+import os
+import re
+import struct
+import sys
+
+MAGIC = b"PGPACK1\n"
+RECORD = struct.Struct("<IQI32s")  # page, offset, length, sha256
+FOOTER = struct.Struct("<QI8s")  # index offset, page count, magic
+PAGE_FILE_RE = re.compile(r"page_(\d+)_extracted_text\.txt$")
+
+def page_filename(page: int) -> str:
+    return f"page_{page:04d}_extracted_text.txt"
+
+def pack_directory(src_dir: str, out_path: str) -> int:
+    """Pack every page_XXXX_extracted_text.txt in src_dir into out_path. Returns the number of pages."""
+    pages = []
+    for name in os.listdir(src_dir):
+        match = PAGE_FILE_RE.match(name)
+        if match:
+            pages.append((int(match.group(1)), name))
+        elif name.endswith(".txt"):
+            print(f"Warning: skipping {name} (not a page_XXXX_extracted_text.txt file)")
+    pages.sort()
+
+    records = []
+    tmp = out_path + ".tmp"
+    with open(tmp, "wb") as out:
+        out.write(MAGIC)
+        offset = len(MAGIC)
+        for page, name in pages:
+            with open(os.path.join(src_dir, name), "rb") as f:
+                data = f.read()
+            out.write(data)
+            records.append(RECORD.pack(page, offset, len(data), hashlib.sha256(data).digest()))
+            offset += len(data)
+        out.write(b"".join(records))
+        out.write(FOOTER.pack(offset, len(records), MAGIC))
+    os.replace(tmp, out_path)
+    return len(records)
+
+class PackedCorpus:
+    """
+    Read-only view of a pack file.
+
+    Memoryviews from page_bytes() and iteration point into the map; drop
+    them before close() (or the end of a with block).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._map)
+        if len(view) < len(MAGIC) + FOOTER.size or view[:len(MAGIC)] != MAGIC:
+            view.release()
+            self._map.close()
+            raise ValueError(f"{path} is not a page pack")
+        index_offset, count, magic = FOOTER.unpack_from(view, len(view) - FOOTER.size)
+        if magic != MAGIC or index_offset + count * RECORD.size != len(view) - FOOTER.size:
+            view.release()
+            self._map.close()
+            raise ValueError(f"{path} is truncated or damaged")
+        self._view = view
+        self._index = {
+            page: (offset, length, digest)
+            for page, offset, length, digest in RECORD.iter_unpack(view[index_offset:index_offset + count * RECORD.size])
+        }
+        self.pages = list(self._index)  # written in page order
+
+    def __len__(self):
+        return len(self.pages)
+
+    def __contains__(self, page):
+        return page in self._index
+
+    def __iter__(self):
+        """(page, memoryview of its text) in page order."""
+        for page in self.pages:
+            yield page, self.page_bytes(page)
+
+    def page_bytes(self, page: int) -> memoryview:
+        offset, length, _ = self._index[page]
+        return self._view[offset:offset + length]
+
+    def text(self, page: int) -> str:
+        return str(self.page_bytes(page), "utf-8")
+
+    def sha256(self, page: int) -> str:
+        return self._index[page][2].hex()
+
+    def verify(self) -> list:
+        """Pages whose text no longer matches its recorded hash."""
+        return [page for page, data in self if hashlib.sha256(data).digest() != self._index[page][2]]
+
+    def export(self, out_dir: str) -> int:
+        """Write every page back out as out_dir/page_XXXX_extracted_text.txt. Returns the number of files."""
+        os.makedirs(out_dir, exist_ok=True)
+        for page, data in self:
+            with open(os.path.join(out_dir, page_filename(page)), "wb") as f:
+                f.write(data)
+        return len(self.pages)
+
+    def close(self):
+        self._view.release()
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack a directory of page text files into one file, or unpack it.")
+    parser.add_argument("command", choices=["pack", "export", "verify"],
+                        help="pack SRC_DIR PACK, export PACK OUT_DIR, or verify PACK")
+    parser.add_argument("paths", nargs="+", help="Directory and/or pack file, as the command needs")
+    args = parser.parse_args()
+
+    if args.command == "pack":
+        if len(args.paths) != 2 or not os.path.isdir(args.paths[0]):
+            parser.error("pack needs SRC_DIR and PACK")
+        count = pack_directory(args.paths[0], args.paths[1])
+        print(f"Packed {count} pages into {args.paths[1]} ({os.path.getsize(args.paths[1]) / 1024:.1f} KB)")
+    elif args.command == "export":
+        if len(args.paths) != 2:
+            parser.error("export needs PACK and OUT_DIR")
+        with PackedCorpus(args.paths[0]) as corpus:
+            count = corpus.export(args.paths[1])
+        print(f"Exported {count} pages to {args.paths[1]}")
+    else:
+        with PackedCorpus(args.paths[0]) as corpus:
+            bad = corpus.verify()
+            print(f"{len(corpus)} pages, pages {corpus.pages[0] if corpus.pages else '-'} to {corpus.pages[-1] if corpus.pages else '-'}")
+        if bad:
+            print(f"Hash mismatch on pages: {bad}")
+            sys.exit(1)
+        print("All page hashes match")
+
+if __name__ == "__main__":
+    main()
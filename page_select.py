@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Page selection for extracted text, replacing the one_page.sh awk pass.
+
+A page spec is a comma-separated list of 1-based page numbers; negative
+numbers count from the end and a-b is an inclusive range:
+
+    1        first page            -1      last page
+    1,-1     first and last        2-4     pages 2, 3 and 4
+
+extract_pdf_text.py --pages SPEC only extracts the selected pages. This
+script rewrites text files that already hold `--- PAGE n ---` blocks, in
+one process, keeping the selected pages. The header lines are dropped
+unless --keep-headers is given, so with the default --pages 1 the output is
+byte-for-byte what one_page.sh's
+`awk '/^--- PAGE 1 ---/{flag=1; next} /^--- PAGE 2 ---/{flag=0} flag'` printed.
+
+Usage:
+    python page_select.py                                     # ordered_text_old/ -> ordered_text_page1_only/, page 1
+    python page_select.py data_two_pages/ data/ --pages -1
+    python page_select.py in/ out/ --pages 1,2 --keep-headers
+"""
+
+import argparse
+import os
+import re
+import sys
+
+IN_DIR = "ordered_text_old"
+OUT_DIR = "ordered_text_page1_only"
+PAGE_HEADER_RE = re.compile(r"^--- PAGE (\d+) ---$", re.MULTILINE)
+
+def parse_page_spec(spec: str) -> list:
+    """
+    Parse a page spec into a list of ints and (first, last) ranges.
+
+    Raises ValueError for anything else, including page 0.
+    """
+    items = []
+    for part in spec.split(","):
+        part = part.strip()
+        if re.fullmatch(r"-?\d+", part):
+            number = int(part)
+            if number == 0:
+                raise ValueError("pages are numbered from 1")
+            items.append(number)
+        elif re.fullmatch(r"\d+-\d+", part):
+            first, last = (int(x) for x in part.split("-"))
+            if first == 0 or last < first:
+                raise ValueError(f"bad page range {part!r}")
+            items.append((first, last))
+        else:
+            raise ValueError(f"bad page selection {part!r}")
+    return items
+
+def select_pages(spec, page_count: int) -> list:
+    """1-based page numbers picked by spec (a string or a parsed list) from page_count pages, in document order."""
+    items = parse_page_spec(spec) if isinstance(spec, str) else spec
+    selected = set()
+    for item in items:
+        if isinstance(item, tuple):
+            selected.update(range(item[0], min(item[1], page_count) + 1))
+        elif item < 0:
+            if -item <= page_count:
+                selected.add(page_count + 1 + item)
+        elif item <= page_count:
+            selected.add(item)
+    return sorted(selected)
+
+def split_page_blocks(text: str) -> list:
+    """
+    [(page number, block)] for text made of `--- PAGE n ---` blocks.
+
+    Each block is everything from the start of its header line up to the
+    next header line, so joining all blocks gives the text back (minus
+    anything before the first header).
+    """
+    headers = list(PAGE_HEADER_RE.finditer(text))
+    blocks = []
+    for i, match in enumerate(headers):
+        end = headers[i + 1].start() if i + 1 < len(headers) else len(text)
+        blocks.append((int(match.group(1)), text[match.start():end]))
+    return blocks
+
+def keep_pages(text: str, spec, bare: bool = False) -> str:
+    """The `--- PAGE n ---` blocks of text picked by spec; without their header lines if bare."""
+    blocks = split_page_blocks(text)
+    # by the numbers in the headers, so a file that already holds a selection still works
+    wanted = set(select_pages(spec, max((number for number, _ in blocks), default=0)))
+    out = []
+    for number, block in blocks:
+        if number not in wanted:
+            continue
+        if bare:
+            block = block.split("\n", 1)[1] if "\n" in block else ""
+        out.append(block)
+    return "".join(out)
+
+def rewrite_directory(in_dir: str, out_dir: str, spec, bare: bool = True) -> int:
+    """Apply keep_pages() to every .txt file in in_dir, writing to out_dir. Returns the number of files."""
+    items = parse_page_spec(spec) if isinstance(spec, str) else spec
+    os.makedirs(out_dir, exist_ok=True)
+    count = 0
+    for name in sorted(os.listdir(in_dir)):
+        if not name.endswith(".txt"):
+            continue
+        with open(os.path.join(in_dir, name), 'r', encoding='utf-8', newline='') as f:
+            text = f.read()
+        with open(os.path.join(out_dir, name), 'w', encoding='utf-8', newline='') as f:
+            f.write(keep_pages(text, items, bare))
+        count += 1
+    return count
+
+def main():
+    parser = argparse.ArgumentParser(description="Keep only some pages of extracted text files.")
+    parser.add_argument("in_dir", nargs="?", default=IN_DIR, help="Directory of *.txt files (default: %(default)s)")
+    parser.add_argument("out_dir", nargs="?", default=OUT_DIR, help="Output directory (default: %(default)s)")
+    parser.add_argument("--pages", default="1", help="Pages to keep, e.g. 1, -1, 1,-1 or 2-4 (default: %(default)s)")
+    parser.add_argument("--keep-headers", action="store_true", help="Keep the --- PAGE n --- lines")
+    args = parser.parse_args()
+
+    try:
+        items = parse_page_spec(args.pages)
+    except ValueError as e:
+        parser.error(str(e))
+    if not os.path.isdir(args.in_dir):
+        print(f"Error: '{args.in_dir}' is not a directory.")
+        sys.exit(1)
+    count = rewrite_directory(args.in_dir, args.out_dir, items, bare=not args.keep_headers)
+    print(f"Wrote {count} files to {args.out_dir} (pages {args.pages})")
+
+if __name__ == "__main__":
+    main()
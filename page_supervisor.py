@@ -0,0 +1,144 @@
+"""
+Supervised per-page text extraction for extract_pdf_text.py.
+
+Page text extraction (by one of the extract_backends.py backends) runs in a child process that the parent feeds one page
+at a time over a pipe. If a page takes longer than the wall-clock limit, the
+child is killed and restarted, and the page is recorded as
+[Extraction timed out]. The child also runs under an address-space limit
+(RLIMIT_AS, where the platform has one), so a page whose content stream
+balloons memory gets the same treatment instead of taking the machine down.
+The child keeps the open PdfReader between pages. It is reused across PDFs
+until it has to be restarted.
+"""
+
+import multiprocessing
+import os
+import time
+
+from extract_backends import DEFAULT_BACKEND, make_backend
+
+try:
+    import resource
+except ImportError:  # not on Windows
+    resource = None
+
+PAGE_TIMEOUT = 30.0  # seconds per page
+PAGE_MEMORY_MB = 1024  # extra address space the child may grow by
+TIMED_OUT = "[Extraction timed out]"
+
+def _address_space() -> int:
+    """Current virtual size of this process in bytes (0 if unknown)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
+def _worker(conn, memory_mb, backend_name):
+    if resource is not None and memory_mb:
+        # relative to what the forked child already maps, so a big parent does not starve it
+        limit = _address_space() + memory_mb * 1024 * 1024
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        if hard == resource.RLIM_INFINITY or limit < hard:
+            resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+    backend = make_backend(backend_name)
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            return
+        if message is None:
+            return
+        command, arg = message
+        started = time.perf_counter()
+        try:
+            if command == "open":
+                result = backend.open(arg)
+            else:
+                result = backend.page_text(arg)
+            conn.send(("ok", result, time.perf_counter() - started))
+        except MemoryError:
+            conn.send(("limit", None, time.perf_counter() - started))
+            return  # the heap may be in a bad state; let the parent start a fresh child
+        except Exception as e:
+            conn.send(("error", str(e), time.perf_counter() - started))
+
+class SupervisedExtractor:
+    """
+    Extract page text in a restartable child process.
+
+    open(path) returns the page count; page(i) returns (status, text or
+    error, seconds). status is "ok", "error" (an exception, as before), or
+    "timeout" (the wall-clock or memory limit was hit).
+    """
+
+    def __init__(self, timeout: float = PAGE_TIMEOUT, memory_mb: int = PAGE_MEMORY_MB, backend: str = DEFAULT_BACKEND):
+        self.timeout = timeout
+        self.memory_mb = memory_mb
+        self.backend = backend
+        self.process = None
+        self.conn = None
+        self.path = None
+        self.restarts = 0
+
+    def _start(self):
+        parent, child = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=_worker, args=(child, self.memory_mb, self.backend), daemon=True)
+        self.process.start()
+        child.close()
+        self.conn = parent
+
+    def _kill(self):
+        if self.process is not None:
+            self.process.kill()
+            self.process.join()
+            self.conn.close()
+        self.process = None
+        self.conn = None
+        self.restarts += 1
+
+    def _call(self, command, arg):
+        if self.process is None:
+            self._start()
+        started = time.perf_counter()
+        try:
+            self.conn.send((command, arg))
+            if self.conn.poll(self.timeout):
+                status, result, seconds = self.conn.recv()
+                if status == "limit":
+                    self._kill()
+                    return "timeout", None, seconds
+                return status, result, seconds
+        except (EOFError, OSError):
+            pass  # the child died, most likely killed by the memory limit
+        self._kill()
+        return "timeout", None, time.perf_counter() - started
+
+    def open(self, path: str) -> int:
+        """Open path in the child. Returns its page count; raises RuntimeError if it cannot be read."""
+        self.path = path
+        status, result, _ = self._call("open", path)
+        if status != "ok":
+            raise RuntimeError("exceeded the time or memory limit" if status == "timeout" else result)
+        return result
+
+    def page(self, index: int):
+        if self.process is None:
+            # restarted after a timeout: reopen the current PDF in the new child
+            try:
+                self.open(self.path)
+            except RuntimeError:
+                return "timeout", None, 0.0
+        return self._call("page", index)
+
+    def close(self):
+        if self.process is not None:
+            try:
+                self.conn.send(None)
+            except OSError:
+                pass
+            self.process.join(1)
+            if self.process.is_alive():
+                self.process.kill()
+            self.conn.close()
+            self.process = None
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Shrink PDFs written by the pipeline (trimmed decks, merge_pdfs.py output).
+
+Every deck is exported from the same slide master, so every file carries the
+master's fonts, logos and form XObjects, often more than once. compact_writer()
+runs three passes over a PdfWriter before it is saved:
+
+    1. drop resources no content stream uses (per page and per form XObject;
+       what a form without /Resources of its own uses stays in its page's)
+    2. Flate-compress unfiltered streams and re-deflate Flate streams at
+       --level when that makes them smaller (lossless; images are untouched)
+    3. merge identical objects and remove the ones nothing references
+
+Inside one trimmed file that removes the duplicate master objects; in a
+merged file it also shares them across all the merged decks.
+
+Usage:
+    python pdf_compact.py ordered_pdfs/                 # compact in place, report sizes
+    python pdf_compact.py merged_document.pdf -o small.pdf
+    python pdf_compact.py last_two_pages/ -o compact/ --workers 4
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+import pypdf
+from pypdf import PdfReader, PdfWriter
+from pypdf.generic import DecodedStreamObject, DictionaryObject, EncodedStreamObject, NameObject
+
+LEVEL = 9
+# resource categories whose entries are referenced by name from content streams
+RESOURCE_CATEGORIES = ("/Font", "/XObject", "/ExtGState", "/ColorSpace", "/Pattern", "/Shading", "/Properties")
+NAME_RE = re.compile(rb"/([^\s/\[\]()<>{}%]*)")
+HEX_ESCAPE_RE = re.compile(rb"#([0-9A-Fa-f]{2})")
+# recompress() and the deduplication loop reach into PdfWriter's object table
+# (_objects, stream _data), which is only checked against these pypdf major versions
+OBJECT_TABLE_TESTED = {6}
+
+def used_names(data: bytes) -> set:
+    """Every /Name token in a content stream, with #xx escapes decoded."""
+    return {
+        "/" + HEX_ESCAPE_RE.sub(lambda m: bytes([int(m.group(1), 16)]), name).decode("latin-1")
+        for name in NAME_RE.findall(data)
+    }
+
+def kept_names(resources, data: bytes) -> set:
+    """
+    The names to keep in resources: those data uses, and those of every form it paints
+    (directly or inside other forms) that has no /Resources of its own.
+
+    Such a form draws on the resources of the page it is painted on, which
+    the spec allows, so its fonts and images must stay in the page's.
+    """
+    names = used_names(data)
+    xobjects = resources.get("/XObject")
+    xobjects = xobjects.get_object() if xobjects is not None else {}
+    pending = [(xobjects, set(names))]
+    seen = set()
+    while pending:
+        table, wanted = pending.pop()
+        for name in wanted:
+            if name not in table:
+                continue
+            form = table[name].get_object()
+            if form.get("/Subtype") != "/Form" or id(form) in seen:
+                continue
+            seen.add(id(form))
+            form_names = used_names(form.get_data())
+            own = form.get("/Resources")
+            if own is None:
+                names |= form_names
+                pending.append((xobjects, form_names))
+            else:
+                inner = own.get_object().get("/XObject")
+                if inner is not None:
+                    pending.append((inner.get_object(), form_names))
+    return names
+
+def prune_resources(owner, data: bytes, done: set):
+    """Replace owner's /Resources with a copy that keeps only names its content uses; recurse into forms."""
+    resources = owner.get("/Resources")
+    if resources is None:
+        return
+    resources = resources.get_object()
+    names = kept_names(resources, data)
+    pruned = DictionaryObject()
+    for key, value in resources.items():
+        if key not in RESOURCE_CATEGORIES:
+            pruned[NameObject(key)] = value
+            continue
+        entries = value.get_object()
+        kept = DictionaryObject({NameObject(k): v for k, v in entries.items() if k in names})
+        if kept:
+            pruned[NameObject(key)] = kept
+    # a fresh direct dictionary: the original may be shared with pages that use other names
+    owner[NameObject("/Resources")] = pruned
+
+    for ref in pruned.get("/XObject", {}).values():
+        form = ref.get_object()
+        key = id(form)
+        if form.get("/Subtype") != "/Form" or key in done:
+            continue
+        done.add(key)
+        prune_resources(form, form.get_data(), done)
+
+def _object_table(writer):
+    """writer's list of objects, or None if this pypdf version is not one it was checked against."""
+    if int(pypdf.__version__.split(".")[0]) not in OBJECT_TABLE_TESTED:
+        return None
+    return writer._objects
+
+def recompress(writer, level: int = LEVEL):
+    """Losslessly recompress streams in place. Returns the number of streams changed."""
+    objects = _object_table(writer)
+    if objects is None:
+        # public API only: the page content streams
+        for page in writer.pages:
+            page.compress_content_streams(level)
+        return len(writer.pages)
+    changed = 0
+    for i, obj in enumerate(objects):
+        if isinstance(obj, DecodedStreamObject) and "/Filter" not in obj:
+            encoded = obj.flate_encode(level)
+            encoded.indirect_reference = obj.indirect_reference
+            objects[i] = encoded
+            changed += 1
+        elif (isinstance(obj, EncodedStreamObject) and obj.get("/Filter") == "/FlateDecode"
+              and "/DecodeParms" not in obj):
+            try:
+                data = zlib.compress(obj.get_data(), level)
+            except Exception:
+                continue  # undecodable stream: leave it as it is
+            if len(data) < len(obj._data):
+                obj._data = data
+                changed += 1
+    return changed
+
+def compact_writer(writer, level: int = LEVEL):
+    """Run all compaction passes on writer; call just before writer.write()."""
+    forms = set()
+    for page in writer.pages:
+        contents = page.get_contents()
+        prune_resources(page, contents.get_data() if contents is not None else b"", forms)
+    recompress(writer, level)
+    if not hasattr(writer, "compress_identical_objects"):
+        return
+    if _object_table(writer) is None:
+        writer.compress_identical_objects()
+        return
+    # an image that points at its own copy of a shared ICC profile only hashes
+    # equal to the others once the profiles are merged, so repeat until stable
+    live = -1
+    while True:
+        # both flags default to on, and their keyword names differ between pypdf versions
+        writer.compress_identical_objects()
+        now = sum(obj is not None for obj in _object_table(writer))
+        if now == live:
+            break
+        live = now
+
+def compact_file(inpath: str, outpath: str, level: int = LEVEL):
+    """Compact inpath into outpath (which may be the same file). Returns (bytes before, bytes after)."""
+    before = os.path.getsize(inpath)
+    writer = PdfWriter(clone_from=PdfReader(inpath))
+    compact_writer(writer, level)
+    tmp = outpath + ".tmp"
+    with open(tmp, "wb") as f:
+        writer.write(f)
+    os.replace(tmp, outpath)
+    return before, os.path.getsize(outpath)
+
+def _compact_job(job):
+    inpath, outpath, level = job
+    try:
+        before, after = compact_file(inpath, outpath, level)
+        return inpath, before, after, None
+    except Exception as e:
+        return inpath, 0, 0, str(e)
+
+def main():
+    parser = argparse.ArgumentParser(description="Losslessly shrink PDFs: unused resources, stream compression, duplicate objects.")
+    parser.add_argument("paths", nargs="+", help="PDF files or directories of PDFs")
+    parser.add_argument("-o", "--out", help="Output file (one input) or directory (default: compact in place)")
+    parser.add_argument("--level", type=int, default=LEVEL, help="zlib level for streams (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes (default: %(default)s)")
+    args = parser.parse_args()
+
+    inputs = []
+    for path in args.paths:
+        if os.path.isdir(path):
+            inputs += [os.path.join(path, n) for n in sorted(os.listdir(path)) if n.lower().endswith(".pdf")]
+        elif os.path.isfile(path):
+            inputs.append(path)
+        else:
+            print(f"Error: '{path}' is not a file or directory.")
+            sys.exit(1)
+    if args.out and (len(inputs) > 1 or os.path.isdir(args.out) or args.out.endswith(os.sep)):
+        os.makedirs(args.out, exist_ok=True)
+        jobs = [(p, os.path.join(args.out, os.path.basename(p)), args.level) for p in inputs]
+    else:
+        jobs = [(p, args.out or p, args.level) for p in inputs]
+
+    started = time.perf_counter()
+    if args.workers <= 1 or len(jobs) <= 1:
+        results = list(map(_compact_job, jobs))
+    else:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            results = list(pool.map(_compact_job, jobs, chunksize=4))
+    elapsed = time.perf_counter() - started
+
+    before = after = 0
+    for inpath, b, a, error in results:
+        if error:
+            print("ERROR processing", inpath, error)
+            continue
+        before += b
+        after += a
+    if len(jobs) == 1 and before:
+        print(f"{jobs[0][1]}: {before / 1024:.1f} KB -> {after / 1024:.1f} KB")
+    mb = 1024 * 1024
+    saved = 100 * (before - after) / before if before else 0
+    print(f"Compacted {len(results)} PDF(s) in {elapsed:.2f}s: {before / mb:.2f} MB -> {after / mb:.2f} MB ({saved:.0f}% smaller)")
+
+if __name__ == "__main__":
+    main()
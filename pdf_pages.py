@@ -0,0 +1,91 @@
+"""
+Page-tree helpers for trimming PDFs to their last pages.
+
+len(reader.pages) and reader.pages[i] make pypdf flatten the whole page
+tree: every /Page dictionary in the file is resolved and wrapped, although
+twopages.py keeps only the last two. last_pages() takes the page count from
+the root /Pages /Count and walks the /Kids arrays right to left, resolving
+only the nodes on the way to the last N leaves. A /Count lower than the
+/Kids it covers, or one that does not match the pages found under a node,
+sends it back to reader.pages. Attributes the spec lets a page inherit from
+its ancestors (/Resources, /MediaBox, /CropBox, /Rotate) are copied onto the
+returned pages. PdfWriter.add_page then clones only what those pages
+reference, because it never follows /Parent.
+"""
+
+from pypdf import PageObject
+from pypdf.generic import IndirectObject, NameObject
+
+INHERITABLE = ("/Resources", "/MediaBox", "/CropBox", "/Rotate")
+
+def page_count(reader):
+    """Number of pages according to the root /Pages /Count (no tree walk); None if it has none."""
+    count = reader.trailer["/Root"]["/Pages"].get("/Count")
+    return None if count is None else int(count)
+
+def last_pages(reader, n: int):
+    """
+    (pages, total) for the last n pages of reader, in document order.
+
+    Falls back to reader.pages when the tree does not add up (a missing or
+    wrong /Count, a cycle), so a damaged file trims the same way it used to.
+    """
+    try:
+        total = page_count(reader)
+        if total is not None:
+            pages = _walk_last(reader, min(n, total))
+            if len(pages) == min(n, total):
+                return pages, total
+    except (KeyError, TypeError, ValueError, RecursionError):
+        pass
+    total = len(reader.pages)
+    return [reader.pages[i] for i in range(max(0, total - n), total)], total
+
+def _count(node) -> int:
+    """Leaves under node: its /Count for a /Pages node, 1 for a page."""
+    if node.get("/Type") != "/Pages" and "/Kids" not in node:
+        return 1
+    return int(node["/Count"])
+
+def _walk_last(reader, wanted: int):
+    found = []
+    visited = set()
+
+    def walk(ref, node, inherited):
+        if ref is not None:
+            if (ref.idnum, ref.generation) in visited:
+                raise ValueError("page tree cycle")
+            visited.add((ref.idnum, ref.generation))
+        if node.get("/Type") != "/Pages" and "/Kids" not in node:
+            page = PageObject(reader, ref)
+            page.update(node)
+            for name, value in inherited.items():
+                if name not in page:
+                    page[NameObject(name)] = value
+            found.append(page)
+            return
+        inherited = dict(inherited)
+        for name in INHERITABLE:
+            if name in node:
+                inherited[name] = node[name]
+        kids = node["/Kids"]
+        # every kid holds at least one page; those walked into hold what their /Count says
+        leaves = len(kids)
+        for kid in reversed(kids):
+            if len(found) >= wanted:
+                break
+            kid_node = kid.get_object()
+            kid_count = _count(kid_node)
+            before = len(found)
+            walk(kid if isinstance(kid, IndirectObject) else None, kid_node, inherited)
+            walked = len(found) - before
+            if walked > kid_count or (walked < kid_count and len(found) < wanted):
+                raise ValueError("page tree /Count does not match the pages under it")
+            leaves += kid_count - 1
+        if leaves > int(node["/Count"]):
+            raise ValueError("page tree /Count is lower than its /Kids hold")
+
+    root = reader.trailer["/Root"].get_object()
+    walk(root.raw_get("/Pages"), root["/Pages"].get_object(), {})
+    found.reverse()
+    return found
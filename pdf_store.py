@@ -0,0 +1,91 @@
+"""
+Content-addressed PDF storage for scra.py.
+
+Every distinct PDF is stored once in the output directory as <sha256>.pdf,
+however many URLs lead to it, and url_index.json maps each URL to the hash
+of the PDF it yielded. Downloads are streamed into a temporary file while
+the hash is computed, so memory use does not depend on the size of the PDF.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+INDEX_FILE = "url_index.json"
+
+class PendingPdf:
+    """A PDF being streamed to disk; commit() moves it to its content address."""
+
+    def __init__(self, store):
+        self.store = store
+        self.sha = hashlib.sha256()
+        self.size = 0
+        fd, self.tmp_path = tempfile.mkstemp(dir=store.out_dir, suffix=".part")
+        self.file = os.fdopen(fd, "wb")
+
+    def write(self, chunk: bytes):
+        self.sha.update(chunk)
+        self.size += len(chunk)
+        self.file.write(chunk)
+
+    @property
+    def digest(self) -> str:
+        return self.sha.hexdigest()
+
+    def commit(self, url: str):
+        """Returns (path, is_new). A PDF that is already stored is not written twice."""
+        self.file.close()
+        path = self.store.path_for(self.digest)
+        is_new = not os.path.exists(path)
+        if is_new:
+            os.replace(self.tmp_path, path)
+        else:
+            os.remove(self.tmp_path)
+        self.store.link(url, self.digest)
+        return path, is_new
+
+    def discard(self):
+        self.file.close()
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+class PdfStore:
+    def __init__(self, out_dir: str):
+        self.out_dir = out_dir
+        self.index_path = os.path.join(out_dir, INDEX_FILE)
+        self.index = {}  # url -> sha256 of the stored PDF
+        self.lock = threading.Lock()
+        os.makedirs(out_dir, exist_ok=True)
+        if os.path.exists(self.index_path):
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                self.index = json.load(f)
+
+    def path_for(self, digest: str) -> str:
+        return os.path.join(self.out_dir, f"{digest}.pdf")
+
+    def open_pdf(self) -> PendingPdf:
+        return PendingPdf(self)
+
+    def put_bytes(self, url: str, data: bytes):
+        """Store an in-memory PDF (e.g. a decoded embedded one). Returns (path, is_new)."""
+        pending = self.open_pdf()
+        try:
+            pending.write(data)
+        except Exception:
+            pending.discard()
+            raise
+        return pending.commit(url)
+
+    def link(self, url: str, digest: str):
+        with self.lock:
+            self.index[url] = digest
+
+    def save(self):
+        with self.lock:
+            data = dict(sorted(self.index.items()))
+        tmp = self.index_path + ".tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp, self.index_path)
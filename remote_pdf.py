@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Fetch only the last pages of a remote PDF using HTTP Range requests.
+
+twopages.py keeps just the last two pages of every deck, so downloading the
+whole deck first is mostly wasted transfer. HttpRangeFile is a seekable
+file object that fetches byte blocks on demand, so pypdf's PdfReader only
+pulls in what it touches: the trailer and xref at the end of the file, the
+page tree, and the objects referenced by the pages we keep. The trimmed PDF
+is written straight from those.
+
+Servers without range support, or files pypdf cannot read lazily, fall back
+to a full download.
+
+Usage:
+    python remote_pdf.py URL [URL ...]                    # last 2 pages into last_two_pages/
+    python remote_pdf.py URL --pages 1 --out-dir first/
+"""
+
+import argparse
+import io
+import os
+import sys
+from urllib.parse import urlparse
+
+import requests
+
+try:
+    from pypdf import PdfReader, PdfWriter
+except ImportError:
+    print("Error: pypdf library not found. Install it with: pip install pypdf")
+    sys.exit(1)
+
+import pdf_pages
+
+BLOCK_SIZE = 64 * 1024  # bytes per range request; neighbouring misses are merged
+OUT_DIR = "last_two_pages"
+
+class RangeNotSupported(Exception):
+    pass
+
+class HttpRangeFile(io.RawIOBase):
+    """Read-only, seekable view of a remote file, fetched block by block with Range requests."""
+
+    def __init__(self, url: str, session=None, block_size: int = BLOCK_SIZE, timeout: int = 20):
+        self.url = url
+        self.session = session or requests.Session()
+        self.block_size = block_size
+        self.timeout = timeout
+        self.blocks = {}
+        self.pos = 0
+        self.requests = 0
+        self.bytes_fetched = 0
+
+        # the trailer is at the end, so start there; the reply also tells us the size
+        r = self._get(f"bytes=-{block_size}")
+        content_range = r.headers.get("content-range", "")
+        if r.status_code != 206 or "/" not in content_range:
+            r.close()
+            raise RangeNotSupported(f"server answered {r.status_code} to a range request")
+        self.size = int(content_range.rsplit("/", 1)[1])
+        data = r.content
+        self.bytes_fetched += len(data)
+        start = self.size - len(data)
+        # keep only whole blocks so later lookups stay aligned; a leading
+        # partial block is dropped and re-fetched if anything reads it
+        first_block = -(-start // block_size)
+        for index in range(first_block, -(-self.size // block_size)):
+            offset = index * block_size - start
+            self.blocks[index] = data[offset:offset + block_size]
+
+    def _get(self, byte_range: str):
+        self.requests += 1
+        return self.session.get(self.url, headers={"Range": byte_range}, timeout=self.timeout, stream=True)
+
+    def _fetch(self, first: int, last: int):
+        """Fetch blocks first..last (inclusive) in one request."""
+        start = first * self.block_size
+        end = min(self.size, (last + 1) * self.block_size) - 1
+        r = self._get(f"bytes={start}-{end}")
+        if r.status_code != 206:
+            r.close()
+            raise RangeNotSupported(f"server answered {r.status_code} to bytes={start}-{end}")
+        data = r.content
+        self.bytes_fetched += len(data)
+        for index in range(first, last + 1):
+            offset = (index - first) * self.block_size
+            self.blocks[index] = data[offset:offset + self.block_size]
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self.pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            self.pos = offset
+        elif whence == io.SEEK_CUR:
+            self.pos += offset
+        elif whence == io.SEEK_END:
+            self.pos = self.size + offset
+        self.pos = max(0, self.pos)
+        return self.pos
+
+    def readinto(self, buffer):
+        if self.pos >= self.size:
+            return 0
+        end = min(self.size, self.pos + len(buffer))
+        first = self.pos // self.block_size
+        last = (end - 1) // self.block_size
+        missing = [i for i in range(first, last + 1) if i not in self.blocks]
+        if missing:
+            self._fetch(missing[0], missing[-1])
+        view = memoryview(buffer)
+        written = 0
+        for index in range(first, last + 1):
+            block = self.blocks[index]
+            lo = max(self.pos, index * self.block_size) - index * self.block_size
+            hi = min(end, (index + 1) * self.block_size) - index * self.block_size
+            view[written:written + hi - lo] = block[lo:hi]
+            written += hi - lo
+        self.pos += written
+        return written
+
+def trim_pdf(stream, last_pages: int, strict: bool = False):
+    """Copy the last `last_pages` pages of the PDF in stream into new PDF bytes. Returns (bytes, total pages)."""
+    reader = PdfReader(stream, strict=strict)
+    pages, n = pdf_pages.last_pages(reader, last_pages)
+    if not pages:
+        raise ValueError("PDF has no pages")
+    writer = PdfWriter()
+    for page in pages:
+        writer.add_page(page)
+    out = io.BytesIO()
+    writer.write(out)
+    return out.getvalue(), n
+
+def fetch_last_pages(url: str, last_pages: int = 2, session=None, block_size: int = BLOCK_SIZE):
+    """
+    Return (pdf bytes, stats) for the last pages of the PDF at url.
+
+    stats has "mode" ("range" or "full"), "size" (the remote file size),
+    "fetched" (bytes actually transferred), "requests" and "pages". After a
+    fallback to a full download, "fetched" and "requests" include what the
+    range attempt already cost.
+    """
+    session = session or requests.Session()
+    remote = None
+    try:
+        remote = HttpRangeFile(url, session, block_size)
+        # non-strict pypdf seeks to every object in the xref to sanity-check
+        # it, which would fetch the whole file; strict mode trusts the xref
+        data, pages = trim_pdf(remote, last_pages, strict=True)
+        return data, {"mode": "range", "size": remote.size, "fetched": remote.bytes_fetched,
+                      "requests": remote.requests, "pages": pages}
+    except Exception as e:
+        reason = str(e)
+    # no ranges, or a file strict pypdf would not read lazily
+    if remote is not None:
+        spent_bytes, spent_requests = remote.bytes_fetched, remote.requests
+    else:
+        spent_bytes, spent_requests = 0, 1  # the first range request, refused before its body was read
+    r = session.get(url, timeout=20)
+    r.raise_for_status()
+    data, pages = trim_pdf(io.BytesIO(r.content), last_pages)
+    return data, {"mode": "full", "size": len(r.content), "fetched": spent_bytes + len(r.content),
+                  "requests": spent_requests + 1, "pages": pages, "fallback_reason": reason}
+
+def main():
+    parser = argparse.ArgumentParser(description="Download only the last pages of remote PDFs.")
+    parser.add_argument("urls", nargs="+", help="PDF URLs")
+    parser.add_argument("--pages", type=int, default=2, help="How many trailing pages to keep (default: %(default)s)")
+    parser.add_argument("--out-dir", default=OUT_DIR, help="Where trimmed PDFs go (default: %(default)s)")
+    parser.add_argument("--block-size", type=int, default=BLOCK_SIZE, help="Bytes per range request (default: %(default)s)")
+    args = parser.parse_args()
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    session = requests.Session()
+    total_size = 0
+    total_fetched = 0
+    for url in args.urls:
+        try:
+            data, stats = fetch_last_pages(url, args.pages, session, args.block_size)
+        except Exception as e:
+            print("ERROR processing", url, e)
+            continue
+        name = os.path.splitext(os.path.basename(urlparse(url).path) or "index")[0]
+        outpath = os.path.join(args.out_dir, f"{name}_last{args.pages}.pdf")
+        with open(outpath, "wb") as f:
+            f.write(data)
+        total_size += stats["size"]
+        total_fetched += stats["fetched"]
+        note = f", fell back: {stats['fallback_reason']}" if stats["mode"] == "full" else ""
+        print(f"Wrote {outpath} ({stats['pages']} -> {min(args.pages, stats['pages'])} pages, "
+              f"{stats['fetched']}/{stats['size']} bytes in {stats['requests']} requests{note})")
+    if total_size:
+        saved = total_size - total_fetched
+        print(f"\nFetched {total_fetched / 1024:.1f} KB of {total_size / 1024:.1f} KB "
+              f"({saved / 1024:.1f} KB, {100 * saved / total_size:.0f}% saved)")
+
+if __name__ == "__main__":
+    main()
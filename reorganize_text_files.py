@@ -9,34 +9,206 @@ maintaining the same page-based naming convention.
 
 Text files: page_XXXX_extracted_text.txt
 PDF files: page_XXXX.pdf (in ordered_pdfs/ subdirectory)
+
+The renamed files don't have to be copies: --mode hardlink, symlink or
+reflink (a copy-on-write clone, on Btrfs/XFS and similar) give them their
+new names without a second copy of the data, falling back to a plain copy
+where the filesystem can't. A file that already points at (or matches) its
+source is left alone, so a re-run only touches what changed.
+
+The page numbers are found by find_page_number(), which mmaps each file and
+scans every page block backwards from its end (where the slide footer sits)
+on a thread pool. The result is written to page_index.json in the output
+directory: per input file, its page number and the byte offsets of the
+footer line and its page block, plus the duplicate and missing page numbers.
 """
 
+import argparse
+import errno
+import json
+import mmap
 import os
 import re
 import shutil
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-def extract_first_page_number(file_path):
-    """Extract the first page number from a text file."""
+try:
+    import fcntl
+except ImportError:  # not on Windows
+    fcntl = None
+
+LINK_MODES = ("copy", "hardlink", "symlink", "reflink")
+PAGE_INDEX = "page_index.json"
+FOOTER_RE = re.compile(rb" (\d+)")  # a whole line: a space and the slide number
+PAGE_HEADER = b"--- PAGE "
+SCAN_CHUNK = 64
+FICLONE = 0x40049409  # linux/fs.h: _IOW(0x94, 9, int)
+
+def _is_current(src, dst, mode):
+    """Whether dst already is what linking src in this mode would make it."""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            
-        # Find all lines that match the pattern: space followed by a number
-        matches = re.findall(r'^ (\d+)$', content, re.MULTILINE)
-        
-        if matches:
-            return int(matches[0])  # Return the first page number found
+        if mode == "symlink":
+            return os.path.islink(dst) and os.readlink(dst) == os.path.relpath(src, os.path.dirname(dst))
+        if os.path.islink(dst):
+            return False
+        if os.path.samefile(src, dst):
+            return True
+        if mode == "hardlink":
+            return False
+        # a copy or a clone: copy2 keeps the mtime, so size and mtime tell whether src changed since
+        src_stat, dst_stat = os.stat(src), os.stat(dst)
+        return src_stat.st_size == dst_stat.st_size and src_stat.st_mtime_ns == dst_stat.st_mtime_ns
+    except OSError:
+        return False
+
+def _reflink(src, tmp):
+    if fcntl is None:
+        raise OSError(errno.EOPNOTSUPP, "reflinks are not supported here")
+    with open(src, 'rb') as fsrc, open(tmp, 'wb') as fdst:
+        fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+    shutil.copystat(src, tmp)
+
+def link_file(src, dst, mode="copy"):
+    """
+    Make dst a copy, hard link, symlink or reflink of src.
+
+    Returns "unchanged" if dst already was one, otherwise the mode actually
+    used: "copy" when the filesystem does not support the requested one (a
+    hard link across devices, a reflink on ext4, ...).
+    """
+    src, dst = str(src), str(dst)
+    if _is_current(src, dst, mode):
+        return "unchanged"
+    tmp = dst + ".tmp"
+    if os.path.lexists(tmp):
+        os.remove(tmp)
+    used = mode
+    try:
+        if mode == "hardlink":
+            os.link(src, tmp)
+        elif mode == "symlink":
+            os.symlink(os.path.relpath(src, os.path.dirname(dst)), tmp)
+        elif mode == "reflink":
+            _reflink(src, tmp)
         else:
-            print(f"Warning: No page number found in {file_path}")
+            shutil.copy2(src, tmp)
+    except OSError:
+        if mode == "copy":
+            raise
+        if os.path.lexists(tmp):
+            os.remove(tmp)
+        shutil.copy2(src, tmp)
+        used = "copy"
+    os.replace(tmp, dst)
+    return used
+
+def _describe(results):
+    """'12 hardlink, 3 unchanged' for a Counter of link_file() results."""
+    return ", ".join(f"{count} {what}" for what, count in sorted(results.items())) or "none"
+
+def _page_blocks(mm):
+    """Yield the (start, end) byte ranges of the --- PAGE n --- blocks in mm, in order (one range if it has none)."""
+    start = 0
+    pos = mm.find(PAGE_HEADER, 1)
+    while pos != -1:
+        if mm[pos - 1] == ord("\n"):
+            yield start, pos
+            start = pos
+        pos = mm.find(PAGE_HEADER, pos + 1)
+    yield start, len(mm)
+
+def _scan_back(mm, start, end):
+    """Offset and number of the last footer line in mm[start:end], reading lines backwards from end."""
+    line_end = end
+    while line_end > start:
+        newline = mm.rfind(b"\n", start, line_end)
+        line_start = start if newline < 0 else newline + 1
+        match = FOOTER_RE.fullmatch(mm[line_start:line_end])
+        if match:
+            return line_start, int(match.group(1))
+        line_end = line_start - 1
+    return None
+
+def find_page_number(file_path):
+    """
+    Find the slide number of a text file: the footer line (" 31") of its first page block that has one.
+
+    Returns {"page", "offset" (of the footer line), "block": [start, end]}
+    with byte offsets, or None if no block has a footer.
+    """
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
             return None
-            
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for start, end in _page_blocks(mm):
+                found = _scan_back(mm, start, end)
+                if found:
+                    return {"page": found[1], "offset": found[0], "block": [start, end]}
+    return None
+
+def extract_first_page_number(file_path):
+    """Extract the first page number from a text file."""
+    try:
+        found = find_page_number(file_path)
+        if found:
+            return found["page"]
+        print(f"Warning: No page number found in {file_path}")
+        return None
     except Exception as e:
         print(f"Error reading {file_path}: {e}")
         return None
 
-def reorganize_text_files(input_dir, output_dir):
-    """Reorganize text files based on their first page number."""
+def build_page_index(text_files, workers=8):
+    """
+    find_page_number() for every file, on a thread pool.
+
+    Returns {"files": {name: entry or None}, "duplicates": {page: [names]},
+    "missing": [pages], "errors": {name: message}}, the page_index.json layout.
+    """
+    def scan(paths):
+        results = []
+        for path in paths:
+            try:
+                results.append((path, find_page_number(path), None))
+            except Exception as e:
+                results.append((path, None, str(e)))
+        return results
+
+    paths = sorted(map(os.fspath, text_files))
+    # a file takes tens of microseconds, so hand each thread a run of files rather than one
+    chunks = [paths[i:i + SCAN_CHUNK] for i in range(0, len(paths), SCAN_CHUNK)]
+    files, errors, by_page = {}, {}, {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for path, found, error in (result for chunk in pool.map(scan, chunks) for result in chunk):
+            name = os.path.basename(path)
+            files[name] = found
+            if error:
+                errors[name] = error
+            elif found:
+                by_page.setdefault(found["page"], []).append(name)
+    pages = sorted(by_page)
+    return {
+        "files": files,
+        "duplicates": {str(page): names for page, names in by_page.items() if len(names) > 1},
+        "missing": sorted(set(range(pages[0], pages[-1] + 1)) - set(pages)) if pages else [],
+        "errors": errors,
+    }
+
+def write_page_index(index, path):
+    tmp = str(path) + ".tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+def reorganize_text_files(input_dir, output_dir, mode="copy", workers=8):
+    """
+    Reorganize text files based on their first page number, placing them with link_file(mode).
+
+    Page numbers are found on a pool of workers threads and written to
+    output_dir/page_index.json.
+    """
     
     # Create output directory if it doesn't exist
     Path(output_dir).mkdir(parents=True, exist_ok=True)
@@ -47,25 +219,28 @@ def reorganize_text_files(input_dir, output_dir):
     
     print(f"Found {len(text_files)} text files to process...")
     
+    index = build_page_index(text_files, workers)
+    write_page_index(index, Path(output_dir) / PAGE_INDEX)
+    
     # Dictionary to store page number to filename mapping
     page_to_file = {}
     files_without_pages = []
     
-    # Process each file
-    for file_path in text_files:
-        page_num = extract_first_page_number(file_path)
-        
-        if page_num is not None:
-            if page_num in page_to_file:
-                print(f"Warning: Page {page_num} found in multiple files:")
-                print(f"  - {page_to_file[page_num]}")
-                print(f"  - {file_path.name}")
-            page_to_file[page_num] = file_path.name
+    for name, error in index["errors"].items():
+        print(f"Error reading {input_path / name}: {error}")
+    for name, found in index["files"].items():
+        if found:
+            page_to_file[found["page"]] = name  # of duplicates, the last name in sorted order wins
         else:
-            files_without_pages.append(file_path.name)
+            files_without_pages.append(name)
+    for page, names in sorted(index["duplicates"].items(), key=lambda item: int(item[0])):
+        print(f"Warning: Page {page} found in multiple files:")
+        for name in names:
+            print(f"  - {name}")
     
-    # Copy files to output directory with new names
+    # Copy (or link) files to output directory with new names
     successful_copies = 0
+    results = Counter()
     
     for page_num, original_filename in page_to_file.items():
         original_path = input_path / original_filename
@@ -75,16 +250,18 @@ def reorganize_text_files(input_dir, output_dir):
         new_path = Path(output_dir) / new_filename
         
         try:
-            shutil.copy2(original_path, new_path)
+            used = link_file(original_path, new_path, mode)
+            results[used] += 1
             successful_copies += 1
-            print(f"Copied: {original_filename} -> {new_filename} (page {page_num})")
+            if used != "unchanged":
+                print(f"Placed ({used}): {original_filename} -> {new_filename} (page {page_num})")
         except Exception as e:
             print(f"Error copying {original_filename}: {e}")
     
     # Report summary
     print(f"\n=== TEXT FILES SUMMARY ===")
     print(f"Total files processed: {len(text_files)}")
-    print(f"Successfully copied: {successful_copies}")
+    print(f"Successfully copied: {successful_copies} ({_describe(results)})")
     print(f"Files without page numbers: {len(files_without_pages)}")
     
     if files_without_pages:
@@ -98,12 +275,7 @@ def reorganize_text_files(input_dir, output_dir):
         max_page = max(page_to_file.keys())
         print(f"\nPage range: {min_page} to {max_page}")
         
-        # Check for missing pages
-        missing_pages = []
-        for page in range(min_page, max_page + 1):
-            if page not in page_to_file:
-                missing_pages.append(page)
-                
+        missing_pages = index["missing"]
         if missing_pages:
             print(f"Missing pages: {missing_pages}")
         else:
@@ -119,8 +291,8 @@ def get_uuid_from_filename(filename):
         return filename.replace('_last2.pdf', '')
     return None
 
-def reorganize_pdf_files(input_dir, pdf_dir, output_dir, page_to_file):
-    """Reorganize PDF files based on the page mapping from text files."""
+def reorganize_pdf_files(input_dir, pdf_dir, output_dir, page_to_file, mode="copy"):
+    """Reorganize PDF files based on the page mapping from text files, placing them with link_file(mode)."""
     
     # Create output directory if it doesn't exist
     pdf_output_dir = Path(output_dir) / "ordered_pdfs"
@@ -139,6 +311,7 @@ def reorganize_pdf_files(input_dir, pdf_dir, output_dir, page_to_file):
     # Track successful PDF copies
     successful_pdf_copies = 0
     missing_pdfs = []
+    results = Counter()
     
     # Process each page number to filename mapping
     for page_num, original_text_filename in page_to_file.items():
@@ -156,9 +329,11 @@ def reorganize_pdf_files(input_dir, pdf_dir, output_dir, page_to_file):
                 new_pdf_path = pdf_output_dir / new_pdf_filename
                 
                 try:
-                    shutil.copy2(pdf_path_full, new_pdf_path)
+                    used = link_file(pdf_path_full, new_pdf_path, mode)
+                    results[used] += 1
                     successful_pdf_copies += 1
-                    print(f"Copied: {pdf_filename} -> {new_pdf_filename} (page {page_num})")
+                    if used != "unchanged":
+                        print(f"Placed ({used}): {pdf_filename} -> {new_pdf_filename} (page {page_num})")
                 except Exception as e:
                     print(f"Error copying {pdf_filename}: {e}")
             else:
@@ -167,7 +342,7 @@ def reorganize_pdf_files(input_dir, pdf_dir, output_dir, page_to_file):
     
     # Report PDF summary
     print(f"\n=== PDF SUMMARY ===")
-    print(f"Successfully copied PDFs: {successful_pdf_copies}")
+    print(f"Successfully copied PDFs: {successful_pdf_copies} ({_describe(results)})")
     print(f"Missing PDFs: {len(missing_pdfs)}")
     
     if missing_pdfs:
@@ -178,16 +353,30 @@ def reorganize_pdf_files(input_dir, pdf_dir, output_dir, page_to_file):
     return successful_pdf_copies
 
 def main():
+    parser = argparse.ArgumentParser(description="Rename extracted text files and their PDFs by page number.")
+    parser.add_argument("--input-dir", default="/workspaces/curriculum-scraper/extracted_text",
+                        help="Extracted text files (default: %(default)s)")
+    parser.add_argument("--pdf-dir", default="/workspaces/curriculum-scraper/last_two_pages",
+                        help="Trimmed PDFs (default: %(default)s)")
+    parser.add_argument("--output-dir", default="/workspaces/curriculum-scraper/ordered_text",
+                        help="Output directory (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=8,
+                        help="Threads scanning the text files for page numbers (default: %(default)s)")
+    parser.add_argument("--mode", choices=LINK_MODES, default="copy",
+                        help="How to place the renamed files; falls back to copy where unsupported (default: %(default)s)")
+    args = parser.parse_args()
+
     # Define input and output directories
-    input_dir = "/workspaces/curriculum-scraper/extracted_text"
-    pdf_dir = "/workspaces/curriculum-scraper/last_two_pages"
-    output_dir = "/workspaces/curriculum-scraper/ordered_text"
+    input_dir = args.input_dir
+    pdf_dir = args.pdf_dir
+    output_dir = args.output_dir
     
     print("PDF Text File Reorganizer")
     print("=" * 30)
     print(f"Input directory: {input_dir}")
     print(f"PDF directory: {pdf_dir}")
     print(f"Output directory: {output_dir}")
+    print(f"Mode: {args.mode}")
     print()
     
     # Check if input directories exist
@@ -200,11 +389,11 @@ def main():
         return
     
     # Reorganize text files first
-    page_to_file = reorganize_text_files(input_dir, output_dir)
+    page_to_file = reorganize_text_files(input_dir, output_dir, args.mode, args.workers)
     
     # Only proceed with PDF reorganization if we have successful text file mappings
     if page_to_file:
-        reorganize_pdf_files(input_dir, pdf_dir, output_dir, page_to_file)
+        reorganize_pdf_files(input_dir, pdf_dir, output_dir, page_to_file, args.mode)
     else:
         print("\nSkipping PDF reorganization - no valid page mappings found.")
 
@@ -4,107 +4,394 @@ import re
 import sys
 import time
 import json
-from urllib.parse import urljoin, urlparse
+import hashlib
+import argparse
+import threading
+import tempfile
+import itertools
+from dataclasses import dataclass
+from typing import Optional
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import urljoin, urlparse, urldefrag
 import requests
-from bs4 import BeautifulSoup
 from tqdm import tqdm
+from crawl_frontier import CrawlFrontier
+from crawl_manifest import CrawlManifest, MANIFEST_FILE
+from pdf_store import PdfStore
+from crawl_metrics import CrawlMetrics, METRICS_FILE
+from embedded_pdf import EmbeddedPdfScanner
+from link_extractor import extract_links, BACKENDS as LINK_BACKENDS, DEFAULT_BACKEND as LINK_BACKEND
 
 START_URL = "https://afrodita.rcub.bg.ac.rs/~dmilicev/publishing/OOP%20predavanja%202024/assets/"  # <- change if needed
 OUT_DIR = "downloaded_pdfs_new"
 MAX_PAGES = 24000  # safety
+WORKERS = 1  # requests in flight; 1 keeps the original one-at-a-time DFS
+RATE = 5.0  # requests per second per host (the old flat 0.2s sleep)
+BURST = 1  # how many requests a host may receive back to back
+STATE_DB = "crawl_state.sqlite"  # persistent frontier, see crawl_frontier.py
+CHUNK_SIZE = 64 * 1024  # bytes read from the socket at a time
+SPOOL_SIZE = 1024 * 1024  # non-PDF bodies larger than this are spooled to disk
+PROBE_MAX_SIZE = 256 * 1024  # with --probe, larger non-PDF, non-text responses are skipped
+MAX_PARSE_SIZE = 8 * 1024 * 1024  # at most this much of a text body is searched for links
+KNOWN_SUFFIXES = (".pdf", ".js", ".html", ".htm", "/")  # never probed, we know what they are
 
-session = requests.Session()
-os.makedirs(OUT_DIR, exist_ok=True)
-
-seen = set()
-to_visit = [START_URL]
-downloaded = 0
+# one requests.Session per worker thread
+_local = threading.local()
 
 # regex to find base64 PDF in text (JVBERi0x... typical)
 b64_pdf_re = re.compile(r'([A-Za-z0-9+/=]{100,})')  # will be filtered by PDF header check
 
-def save_bytes_as_pdf(data: bytes, filename: str):
-    with open(filename, "wb") as f:
-        f.write(data)
-
-def try_extract_base64_and_save(text, out_path_prefix):
-    # attempt to find a PDF base64 block inside text
-    # often it's inside local_pdf({... "pdf": "JVBERi0x..." })
-    # search for "JVBERi0" start
-    hits = re.findall(r'JVBERi0[^\"]{20,}', text)  # find likely base64 starts
-    for i, hit in enumerate(hits):
-        # cut to contiguous base64 characters
-        b64 = re.match(r'(JVBERi0[A-Za-z0-9+/=]+)', hit)
-        if b64:
-            s = b64.group(1)
-            try:
-                import base64
-                raw = base64.b64decode(s + "===")  # pad just in case
-                if raw.startswith(b'%PDF'):
-                    out = f"{out_path_prefix}_embedded_{i}.pdf"
-                    save_bytes_as_pdf(raw, out)
-                    print("Saved embedded pdf:", out)
-                    return True
-            except Exception:
-                pass
-    # fallback: search for "pdf" : "..." style JSON
-    js_matches = re.findall(r'"pdf"\s*:\s*"([A-Za-z0-9+/=]+)"', text)
-    for i, s in enumerate(js_matches):
-        try:
-            import base64
-            raw = base64.b64decode(s + "===")
-            if raw.startswith(b'%PDF'):
-                out = f"{out_path_prefix}_embedded_json_{i}.pdf"
-                save_bytes_as_pdf(raw, out)
-                print("Saved embedded pdf (json):", out)
-                return True
-        except Exception:
-            pass
+class TokenBucket:
+    """Refills `rate` tokens per second up to `capacity`; acquire() blocks until one is free."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+
+class HostRateLimiter:
+    """One token bucket per host, so politeness holds no matter how many workers run."""
+
+    def __init__(self, rate: float = RATE, burst: int = BURST):
+        self.rate = rate
+        self.burst = burst
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def wait(self, url: str):
+        if self.rate <= 0:
+            return
+        host = urlparse(url).netloc
+        with self.lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                bucket = self.buckets[host] = TokenBucket(self.rate, self.burst)
+        bucket.acquire()
+
+def get_session() -> requests.Session:
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = _local.session = requests.Session()
+    return session
+
+class ProbeStats:
+    """What --probe cost and what it saved, summed over all workers."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.probes = 0
+        self.skipped = 0
+        self.bytes_saved = 0
+
+    def add(self, skipped_size=None):
+        with self.lock:
+            self.probes += 1
+            if skipped_size is not None:
+                self.skipped += 1
+                self.bytes_saved += skipped_size
+
+    def print_report(self):
+        print(f"Probes: {self.probes}, skipped: {self.skipped}, "
+              f"bytes not downloaded: {self.bytes_saved / (1024 * 1024):.1f} MB")
+
+@dataclass
+class CrawlContext:
+    """Everything download_url needs besides the URL; shared by all workers."""
+    store: PdfStore
+    start_url: str = START_URL
+    limiter: Optional[HostRateLimiter] = None
+    manifest: Optional[CrawlManifest] = None
+    link_backend: str = LINK_BACKEND
+    probe: Optional[ProbeStats] = None
+    metrics: Optional[CrawlMetrics] = None
+
+def url_priority(url: str) -> int:
+    """Higher is fetched sooner: PDFs, then viewer JS assets, then anything under assets/."""
+    path = urlparse(url).path.lower()
+    if path.endswith(".pdf"):
+        return 3
+    if path.endswith(".js"):
+        return 2
+    if "/assets/" in path:
+        return 1
+    return 0
+
+def should_follow(url: str, start_url: str) -> bool:
+    """Same host, under the start URL's directory, and not a directory-listing sort link."""
+    parsed = urlparse(url)
+    start = urlparse(start_url)
+    if parsed.scheme not in ("http", "https") or parsed.netloc != start.netloc:
+        return False
+    if parsed.query:
+        # Apache listings link to themselves as ?C=N;O=D etc.
+        return False
+    prefix = start.path.rsplit("/", 1)[0] + "/"
+    return parsed.path.startswith(prefix)
+
+def is_textual(content_type: str) -> bool:
+    """Whether a response of this (lowercased) content type may be a page or script with links."""
+    return (not content_type or content_type.startswith("text/")
+            or any(t in content_type for t in ("javascript", "json", "html", "xml")))
+
+def probe_url(url: str, ctx: CrawlContext) -> bool:
+    """
+    Ask for the first 8 bytes before downloading a URL of unknown type.
+
+    Returns False for large responses that are neither PDF nor text (images,
+    video, archives), which can never yield a slide PDF.
+    """
+    if ctx.limiter is not None:
+        ctx.limiter.wait(url)
+    try:
+        with get_session().get(url, timeout=20, headers={"Range": "bytes=0-7"}, stream=True) as r:
+            content_type = r.headers.get("content-type", "").lower()
+            head = next(r.iter_content(8), b"")
+            total = None
+            content_range = r.headers.get("content-range", "")
+            if r.status_code == 206 and "/" in content_range:
+                total = content_range.rsplit("/", 1)[1]
+            elif r.status_code == 200:
+                total = r.headers.get("content-length")
+            total = int(total) if total and total.isdigit() else None
+    except Exception:
+        ctx.probe.add()
+        return True
+    if content_type.startswith("application/pdf") or head.startswith(b"%PDF") or is_textual(content_type) \
+            or total is None or total <= PROBE_MAX_SIZE:
+        ctx.probe.add()
+        return True
+    ctx.probe.add(total - len(head))
+    print(f"Skipped after probe ({content_type}, {total} bytes):", url)
     return False
 
-def download_url(url):
-    global downloaded
+def download_url(url, ctx: CrawlContext):
+    """
+    Fetch one URL and save any PDF it yields into the content-addressed store.
+
+    Returns (saved, links): whether the URL yielded a PDF and the links
+    worth following from the page. Frontier bookkeeping is left to the caller
+    so this can run on worker threads. With a manifest, unchanged assets are
+    not written again and their links come from the previous run.
+
+    The body is streamed in CHUNK_SIZE pieces: PDFs go straight to disk,
+    embedded base64 PDFs are decoded to disk as they arrive, and the first
+    MAX_PARSE_SIZE bytes of a text body are spooled to a temporary file to be
+    parsed for links. Other bodies (images, fonts, archives) are only hashed.
+    """
+    rec = {"url": url, "status": None, "kind": "error", "bytes": 0}
     try:
-        r = session.get(url, timeout=20)
+        return _download(url, ctx, rec)
+    finally:
+        if ctx.metrics is not None:
+            ctx.metrics.record(rec)
+
+def _download(url, ctx, rec):
+    """download_url proper; fills in the metrics record `rec` as it goes."""
+    if ctx.probe is not None and not urlparse(url).path.lower().endswith(KNOWN_SUFFIXES):
+        if not probe_url(url, ctx):
+            rec["kind"] = "skipped"
+            return False, []
+    if ctx.limiter is not None:
+        ctx.limiter.wait(url)
+    # timing starts after the politeness wait, which is not the server's fault
+    started = time.perf_counter()
+    try:
+        return _fetch(url, ctx, rec, started)
+    finally:
+        rec["total_s"] = round(time.perf_counter() - started, 4)
+
+def _fetch(url, ctx, rec, started):
+    """The request itself, timed from `started`."""
+    store, manifest = ctx.store, ctx.manifest
+    headers = manifest.conditional_headers(url) if manifest is not None else {}
+    decode_s = 0.0
+    try:
+        with get_session().get(url, timeout=20, headers=headers, stream=True) as r:
+            rec["status"] = r.status_code
+            rec["ttfb_s"] = round(time.perf_counter() - started, 4)
+            if r.status_code == 304 and manifest is not None:
+                rec["kind"] = "not_modified"
+                entry = manifest.not_modified_entry(url)
+                print("Not modified:", url)
+                return bool(entry.get("outputs")), entry.get("links", [])
+            content_type = r.headers.get("content-type","").lower()
+            chunks = r.iter_content(CHUNK_SIZE)
+            first = next(chunks, b"")
+            if content_type.startswith("application/pdf") or first.startswith(b"%PDF"):
+                rec["kind"] = "pdf"
+                pending = store.open_pdf()
+                try:
+                    pending.write(first)
+                    for chunk in chunks:
+                        pending.write(chunk)
+                except Exception:
+                    pending.discard()
+                    raise
+                finally:
+                    rec["bytes"] = pending.size
+                digest = pending.digest
+                filename, is_new = pending.commit(url)
+                print("Downloaded PDF:" if is_new else "Already stored:", filename)
+                if manifest is not None:
+                    # a PDF already in the store needs no reprocessing downstream
+                    manifest.record(url, r.headers, digest, [filename], [], changed=is_new)
+                return True, []
+            # one pass over the body: hash it, decode any embedded base64 PDF
+            # straight into the store, and spool the start of a text body to parse
+            parse = is_textual(content_type)
+            body = tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE)
+            sha = hashlib.sha256()
+            scanner = EmbeddedPdfScanner(store, url)
+            for chunk in itertools.chain([first], chunks):
+                rec["bytes"] += len(chunk)
+                sha.update(chunk)
+                if scanner.result is None:
+                    t = time.perf_counter()
+                    scanner.feed(chunk)
+                    decode_s += time.perf_counter() - t
+                    if parse and body.tell() < MAX_PARSE_SIZE:
+                        body.write(chunk[:MAX_PARSE_SIZE - body.tell()])
+            t = time.perf_counter()
+            embedded = scanner.close()
+            decode_s += time.perf_counter() - t
+            rec["decode_s"] = round(decode_s, 4)
+            encoding = r.encoding or "utf-8"
+            response_headers = r.headers
     except Exception as e:
         print("failed", url, e)
-        return
-    content_type = r.headers.get("content-type","").lower()
-    basename = os.path.basename(urlparse(url).path) or "index"
-    if content_type.startswith("application/pdf") or r.content.startswith(b"%PDF"):
-        # save pdf
-        filename = os.path.join(OUT_DIR, basename if basename.endswith(".pdf") else basename + ".pdf")
-        save_bytes_as_pdf(r.content, filename)
-        downloaded += 1
-        print("Downloaded PDF:", filename)
-        return
-    text = r.text
-    # try to extract embedded base64 PDF from text
-    if try_extract_base64_and_save(text, os.path.join(OUT_DIR, basename)):
-        downloaded += 1
+        rec["error"] = str(e)
+        return False, []
+
+    with body:
+        digest = sha.hexdigest()
+        if manifest is not None:
+            entry = manifest.unchanged_entry(url, digest)
+            if entry is not None:
+                rec["kind"] = "unchanged"
+                manifest.record(url, response_headers, digest, entry["outputs"], entry["links"], changed=False)
+                print("Unchanged:", url)
+                return bool(entry["outputs"]), entry["links"]
+        if not embedded and parse:
+            body.seek(0)
+            text = body.read().decode(encoding, errors="replace")
+
+    outputs = []
+    links = []
+    if embedded:
+        rec["kind"] = "embedded"
+        outputs.append(embedded)
+    elif not parse:
+        rec["kind"] = "other"
     else:
+        rec["kind"] = "html"
+        t = time.perf_counter()
         # parse html for links to follow
-        soup = BeautifulSoup(text, "html.parser")
-        for a in soup.find_all("a", href=True):
-            href = a["href"]
+        for href in extract_links(text, ctx.link_backend):
             # only follow links inside same folder / site
-            joined = urljoin(url, href)
-            if ';' in joined or 'w' in joined:
-                continue
-            # keep same netloc and starting path prefix
-            if urlparse(joined).netloc == urlparse(START_URL).netloc and joined not in seen:
-                if len(to_visit) + len(seen) < MAX_PAGES:
-                    to_visit.append(joined)
-
-# DFS crawl
-while to_visit and len(seen) < MAX_PAGES:
-    url = to_visit.pop(-1)
-    if url in seen: 
-        continue
-    seen.add(url)
-    print("Visiting:", url)
-    
-    download_url(url)
-    time.sleep(0.2)  # be polite
-
-print("Done. PDFs saved in", OUT_DIR)
+            joined = urldefrag(urljoin(url, href))[0]
+            if should_follow(joined, ctx.start_url):
+                links.append(joined)
+        rec["parse_s"] = round(time.perf_counter() - t, 4)
+    if manifest is not None:
+        manifest.record(url, response_headers, digest, outputs, links)
+    return bool(outputs), links
+
+def crawl(frontier, ctx: CrawlContext, workers=WORKERS):
+    """
+    Best-first crawl over `frontier` with up to `workers` requests in flight.
+
+    Likely PDFs and assets are fetched before navigation pages (url_priority);
+    ties are broken depth-first. The frontier is only touched on this thread;
+    workers just fetch and save.
+    """
+    in_flight = {}
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        try:
+            while True:
+                while len(in_flight) < workers and frontier.visited < MAX_PAGES:
+                    url = frontier.pop()
+                    if url is None:
+                        break
+                    print("Visiting:", url)
+                    in_flight[pool.submit(download_url, url, ctx)] = url
+                if not in_flight:
+                    break
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    url = in_flight.pop(future)
+                    saved, links = future.result()
+                    for joined in links:
+                        if len(frontier) < MAX_PAGES:
+                            frontier.push(joined, url_priority(joined))
+                    frontier.mark_done(url, saved)
+        finally:
+            # on Ctrl-C, keep whatever finished; in-flight URLs are re-queued on --resume
+            frontier.flush()
+            for future in in_flight:
+                future.cancel()
+
+    return frontier.downloaded
+
+def main():
+    parser = argparse.ArgumentParser(description="Crawl the course site and download slide PDFs.")
+    parser.add_argument("--start-url", default=START_URL, help="Where to start crawling (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=WORKERS, help="Requests in flight at once (default: %(default)s)")
+    parser.add_argument("--rate", type=float, default=RATE, help="Requests per second per host, 0 disables (default: %(default)s)")
+    parser.add_argument("--burst", type=int, default=BURST, help="Requests a host may get back to back (default: %(default)s)")
+    parser.add_argument("--state", default=STATE_DB, help="SQLite file holding the crawl frontier (default: %(default)s)")
+    parser.add_argument("--resume", action="store_true", help="Continue the crawl recorded in --state instead of starting over")
+    parser.add_argument("--manifest", default=MANIFEST_FILE, help="ETag/Last-Modified/hash cache per URL (default: %(default)s)")
+    parser.add_argument("--recrawl", action="store_true", help="Send conditional requests and only rewrite assets that changed")
+    parser.add_argument("--link-backend", choices=sorted(LINK_BACKENDS), default=LINK_BACKEND, help="How links are pulled out of HTML pages (default: %(default)s)")
+    parser.add_argument("--probe", action="store_true", help="Range-probe URLs of unknown type and skip large non-PDF, non-text ones")
+    parser.add_argument("--metrics", default=METRICS_FILE, help="JSONL file with one record per request (default: %(default)s)")
+    args = parser.parse_args()
+
+    store = PdfStore(OUT_DIR)
+    frontier = CrawlFrontier(args.state, resume=args.resume)
+    if args.resume and len(frontier):
+        print(f"Resuming: {frontier.visited} visited, {frontier.queued} queued, {frontier.downloaded} PDFs so far")
+    else:
+        frontier.set_meta("start_url", args.start_url)
+        frontier.push(args.start_url, url_priority(args.start_url))
+    ctx = CrawlContext(
+        store=store,
+        start_url=frontier.get_meta("start_url"),
+        limiter=HostRateLimiter(args.rate, args.burst),
+        manifest=CrawlManifest(args.manifest, conditional=args.recrawl),
+        link_backend=args.link_backend,
+        probe=ProbeStats() if args.probe else None,
+        metrics=CrawlMetrics(args.metrics),
+    )
+    started = time.time()
+    try:
+        downloaded = crawl(frontier, ctx, max(1, args.workers))
+    finally:
+        frontier.close()
+        ctx.manifest.save()
+        ctx.metrics.close()
+        store.save()
+    ctx.manifest.print_report()
+    if ctx.probe is not None:
+        ctx.probe.print_report()
+    ctx.metrics.print_summary(time.time() - started)
+    distinct = len(set(store.index.values()))
+    print(f"Done. {downloaded} PDFs ({distinct} distinct) saved in {OUT_DIR} ({time.time() - started:.1f}s)")
+
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,163 @@
-# extract_last_two_pages.py
+#!/usr/bin/env python3
+"""
+Keep only the last pages of every PDF in a directory.
+
+Each input <name>.pdf becomes <out_dir>/<name>_last2.pdf (or _last<N>.pdf)
+holding the last N pages. Files are trimmed on a process pool; output and the
+per-file log lines come out in sorted file-name order, so a run gives the
+same result whatever the worker count. Inputs already trimmed with the same
+settings (per build_manifest.json) are skipped, and trimmed copies of deleted
+inputs are removed.
+
+Usage:
+    python twopages.py                                   # downloaded_pdfs_new/ -> last_two_pages/
+    python twopages.py ordered_pdfs/ trimmed/ --last 1 --workers 4
+"""
+
+import argparse
+import io
 import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pypdf
 from pypdf import PdfReader, PdfWriter
 
-IN_DIR = input("In_dir?")
+from build_manifest import BuildManifest, BUILD_MANIFEST
+from pdf_compact import compact_writer
+from pdf_pages import last_pages
+
+IN_DIR = "downloaded_pdfs_new"
 OUT_DIR = "last_two_pages"
-os.makedirs(OUT_DIR, exist_ok=True)
+LAST_PAGES = 2
+# bump when a change to trimming should invalidate outputs already built
+TOOL = f"twopages/2 pypdf/{pypdf.__version__}"
+
+def output_name(name: str, last: int) -> str:
+    return os.path.splitext(name)[0] + f"_last{last}.pdf"
+
+def trim_pdf(inpath: str, outpath: str, last: int = LAST_PAGES, compact: bool = False):
+    """
+    Write the last `last` pages of inpath to outpath.
+
+    Returns (pages in, pages out, bytes before compaction); (0, 0, 0) for an
+    empty PDF. Without compact the byte count is simply the output size.
+    """
+    reader = PdfReader(inpath)
+    # walks only the branch of the page tree that leads to the pages we keep
+    pages, n = last_pages(reader, last)
+    if n == 0:
+        return 0, 0, 0
+    writer = PdfWriter()
+    for page in pages:
+        writer.add_page(page)
+    if compact:
+        plain = io.BytesIO()
+        writer.write(plain)
+        before = plain.tell()
+        compact_writer(writer)
+    with open(outpath, "wb") as f:
+        writer.write(f)
+    return n, len(pages), before if compact else os.path.getsize(outpath)
 
-for name in os.listdir(IN_DIR):
-    if not name.lower().endswith(".pdf"):
-        continue
-    inpath = os.path.join(IN_DIR, name)
+def _trim_job(job):
+    """Pool entry point: (inpath, outpath, last, compact) -> (inpath, outpath, pages in, pages out, bytes before, error)."""
+    inpath, outpath, last, compact = job
     try:
-        reader = PdfReader(inpath)
-        n = len(reader.pages)
-        if n == 0:
-            print("empty?", inpath)
-            continue
-        # pick last two pages (if only 1 page exists, just copy it)
-        start = max(0, n-2)
-        writer = PdfWriter()
-        for i in range(start, n):
-            writer.add_page(reader.pages[i])
-        outname = os.path.splitext(name)[0] + "_last2.pdf"
-        outpath = os.path.join(OUT_DIR, outname)
-        with open(outpath, "wb") as f:
-            writer.write(f)
-        print("Wrote", outpath, "(", n, "->", n-start, "pages )")
+        n, kept, before = trim_pdf(inpath, outpath, last, compact)
+        return inpath, outpath, n, kept, before, None
     except Exception as e:
-        print("ERROR processing", inpath, e)
+        return inpath, outpath, 0, 0, 0, str(e)
+
+def trim_directory(in_dir: str, out_dir: str, last: int = LAST_PAGES, workers: int = 1, compact: bool = False,
+                   manifest=None):
+    """
+    Trim every PDF in in_dir into out_dir.
+
+    With a BuildManifest, inputs whose output is up to date are skipped and
+    outputs of deleted inputs are removed. Returns (job results in sorted
+    file-name order, number of skipped inputs).
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    names = sorted(name for name in os.listdir(in_dir) if name.lower().endswith(".pdf"))
+    jobs = [(os.path.join(in_dir, name), os.path.join(out_dir, output_name(name, last)), last, compact)
+            for name in names]
+    skipped = 0
+    if manifest is not None:
+        for removed in manifest.remove_orphans():
+            print("Removed", removed, "(input is gone)")
+        stale = [job for job in jobs if not manifest.is_fresh(job[0], job[1])]
+        skipped = len(jobs) - len(stale)
+        jobs = stale
+    if workers <= 1 or len(jobs) <= 1:
+        results = [report(result, manifest) for result in map(_trim_job, jobs)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # map() yields in submission order, so the log is the same as a serial run
+            results = [report(result, manifest) for result in pool.map(_trim_job, jobs, chunksize=4)]
+    if manifest is not None:
+        manifest.save()
+    return results, skipped
+
+def report(result, manifest=None):
+    inpath, outpath, n, kept, _, error = result
+    if error:
+        print("ERROR processing", inpath, error)
+    elif n == 0:
+        print("empty?", inpath)
+    else:
+        print("Wrote", outpath, "(", n, "->", kept, "pages )")
+    if manifest is not None:
+        if error or n == 0:
+            manifest.forget(inpath)
+        else:
+            replaced = manifest.record(inpath, outpath)
+            if replaced:
+                print("Removed", replaced, "(replaced by", outpath + ")")
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="Keep only the last pages of every PDF in a directory.")
+    parser.add_argument("in_dir", nargs="?", default=IN_DIR, help="Directory of PDFs (default: %(default)s)")
+    parser.add_argument("out_dir", nargs="?", default=OUT_DIR, help="Where trimmed PDFs go (default: %(default)s)")
+    parser.add_argument("--last", type=int, default=LAST_PAGES, help="Trailing pages to keep (default: %(default)s)")
+    parser.add_argument("--compact", action="store_true",
+                        help="Drop unused resources, recompress streams and merge duplicate objects (see pdf_compact.py)")
+    parser.add_argument("--force", action="store_true", help=f"Re-trim every input, even if {BUILD_MANIFEST} says it is up to date")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes; 1 trims in this process (default: %(default)s)")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.in_dir):
+        print(f"Error: '{args.in_dir}' is not a directory.")
+        sys.exit(1)
+    if args.last < 1:
+        parser.error("--last must be at least 1")
+
+    started = time.perf_counter()
+    manifest = BuildManifest("twopages", args.out_dir, TOOL, {"last": args.last, "compact": args.compact})
+    if args.force:
+        manifest.mark_stale()
+    results, skipped = trim_directory(args.in_dir, args.out_dir, args.last, args.workers, args.compact, manifest)
+    elapsed = max(time.perf_counter() - started, 1e-9)
+
+    errors = [(inpath, error) for inpath, _, _, _, _, error in results if error]
+    written = [(outpath, before) for _, outpath, n, _, before, error in results if n and not error]
+    pages = sum(n for _, _, n, _, _, _ in results)
+    print(f"\nTrimmed {len(written)}/{len(results)} PDFs in {elapsed:.2f}s with {args.workers} worker(s): "
+          f"{len(results) / elapsed:.1f} files/s, {pages / elapsed:.1f} pages/s")
+    if skipped:
+        print(f"Skipped {skipped} up-to-date PDF(s) (--force to redo them)")
+    if args.compact and written:
+        before = sum(b for _, b in written)
+        after = sum(os.path.getsize(outpath) for outpath, _ in written)
+        print(f"Compacted output: {before / (1024 * 1024):.2f} MB -> {after / (1024 * 1024):.2f} MB "
+              f"({100 * (before - after) / before:.0f}% smaller)")
+    if errors:
+        print(f"{len(errors)} file(s) failed:")
+        for inpath, error in errors:
+            print(f"  {inpath}: {error}")
+
+if __name__ == "__main__":
+    main()